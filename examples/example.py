@@ -34,7 +34,7 @@ def basic_usage():
 def advanced_usage():
     """高级用法示例"""
     # 使用链式调用添加网关
-    sms = SMSBuilder.builder() \
+    builder = SMSBuilder.builder() \
         .gateway(
             name="smsbao",
             app_id="your_username",
@@ -43,8 +43,8 @@ def advanced_usage():
         ) \
         .juhe(key="your_app_key") \
         .strategy("random") \
-        .debug(True) \
-        .build()
+        .debug(True)
+    sms = builder.build()
     
     # 发送短信
     response = sms.send(
@@ -52,6 +52,11 @@ def advanced_usage():
         content="您的验证码是1234，5分钟内有效。"
     )
     print(response)
+    
+    # 同一条短信发送给多个号码时复用消息对象
+    message = builder.message(content="系统将于今晚22:00维护，请提前保存数据。")
+    for phone in ["your_phone_1", "your_phone_2"]:
+        print(sms.send(phone, message))
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ from .phone_number import PhoneNumber
 from .message import Message
 from .config import SMSConfig, GatewayConfig
 from .request import SMSRequest
+from .async_request import AsyncSMSRequest
 from .response import SMSResponse, SMSBatchResponse, SMSStatus, SMSError
 from .builder import SMSBuilder
 
@@ -18,6 +19,7 @@ __all__ = [
     "SMSConfig",      # 短信配置类
     "GatewayConfig",  # 网关配置类
     "SMSRequest",     # 短信请求类
+    "AsyncSMSRequest", # 异步短信请求类
     "SMSResponse",    # 短信响应类
     "SMSBatchResponse", # 批量短信响应类
     "SMSStatus",      # 短信状态枚举
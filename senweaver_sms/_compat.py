@@ -0,0 +1,73 @@
+"""
+兼容性工具 - 屏蔽不同 Python 版本之间的差异
+"""
+import sys
+import dataclasses
+import functools
+
+
+def _add_slots(cls: type) -> type:
+    """
+    为数据类重新创建一个带 __slots__ 的类 (Python 3.10 以下的实现)
+
+    init=False 且只有 default 的字段原本依赖类属性提供默认值，类属性移除后改由 __init__ 赋值，
+    与 dataclass(slots=True) 生成的 __init__ 行为一致
+
+    Args:
+        cls: 已经过 dataclass 处理的类
+
+    Returns:
+        带 __slots__ 的新类
+    """
+    cls_dict = dict(cls.__dict__)
+    fields = dataclasses.fields(cls)
+    field_names = tuple(f.name for f in fields)
+    cls_dict["__slots__"] = field_names
+    # 字段默认值已保存在 __init__ 中，类属性会与 slot 描述符冲突
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    defaults = tuple(
+        (f.name, f.default) for f in fields
+        if not f.init and f.default is not dataclasses.MISSING
+    )
+    if defaults:
+        init = cls_dict["__init__"]
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kwargs):
+            # 在原 __init__ 之前赋值，__post_init__ 中即可读取
+            for name, value in defaults:
+                object.__setattr__(self, name, value)
+            init(self, *args, **kwargs)
+
+        cls_dict["__init__"] = __init__
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+def slotted_dataclass(cls=None, **kwargs):
+    """
+    带 __slots__ 的 dataclass 装饰器
+
+    Python 3.10+ 使用 dataclass(slots=True)，更低版本重新创建带 __slots__ 的类
+
+    Args:
+        cls: 被装饰的类
+        **kwargs: 传递给 dataclass 的参数
+
+    Returns:
+        数据类
+    """
+    def wrap(cls):
+        if sys.version_info >= (3, 10):
+            return dataclasses.dataclass(cls, slots=True, **kwargs)
+        return _add_slots(dataclasses.dataclass(cls, **kwargs))
+
+    if cls is None:
+        return wrap
+    return wrap(cls)
@@ -0,0 +1,371 @@
+"""
+HTTP 辅助工具 - 同步/异步请求的公共部分
+"""
+import sys
+import ssl
+import asyncio
+import threading
+import weakref
+from typing import Dict, Any, Optional, Tuple, List
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.retry import Retry
+
+from ._json import loads
+
+
+# 按 (endpoint, ssl_verify) 共享的同步会话，跨 SMSRequest 实例复用连接
+_SESSIONS: Dict[Tuple[str, bool], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# 进程内共享的 SSLContext，CA 证书只解析一次
+_SSL_CONTEXT: Optional[ssl.SSLContext] = None
+_SSL_CONTEXT_LOCK = threading.Lock()
+
+
+class AsyncHTTPResponse:
+    """
+    异步响应的轻量封装
+
+    提供与 requests.Response 一致的常用接口 (status_code / content / text / json /
+    raise_for_status)，使网关的响应解析逻辑可以在同步与异步路径间复用
+    """
+
+    def __init__(self, status_code: int, content: bytes, url: str,
+                 reason: Optional[str] = None, encoding: Optional[str] = None):
+        """
+        初始化
+
+        Args:
+            status_code: HTTP状态码
+            content: 响应体
+            url: 请求地址
+            reason: 状态描述
+            encoding: 响应编码
+        """
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.reason = reason or ""
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        """
+        响应文本
+        """
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        """
+        解析JSON响应
+        """
+        return loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """
+        状态码为4xx/5xx时抛出 requests.HTTPError，与同步路径保持一致
+        """
+        if 400 <= self.status_code < 500:
+            kind = "Client Error"
+        elif 500 <= self.status_code < 600:
+            kind = "Server Error"
+        else:
+            return
+        raise requests.exceptions.HTTPError(
+            f"{self.status_code} {kind}: {self.reason} for url: {self.url}",
+            response=self
+        )
+
+
+def _endpoint_of(url: str) -> str:
+    """
+    提取请求地址的 scheme://host[:port] 部分
+
+    Args:
+        url: 请求地址
+
+    Returns:
+        端点地址
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """
+    获取进程内共享的 SSLContext，首次使用时加载 requests 默认的 CA 证书
+
+    Returns:
+        ssl.SSLContext
+    """
+    global _SSL_CONTEXT
+    if _SSL_CONTEXT is None:
+        with _SSL_CONTEXT_LOCK:
+            if _SSL_CONTEXT is None:
+                _SSL_CONTEXT = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+    return _SSL_CONTEXT
+
+
+class _SharedSSLAdapter(HTTPAdapter):
+    """
+    使用共享 SSLContext 的适配器
+
+    requests 默认会为每个连接重新加载 CA 证书文件；共享的上下文已加载证书，
+    验证证书时不再指定 ca_certs
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("ssl_context", get_ssl_context())
+        super().init_poolmanager(*args, **kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        if verify is True and url.lower().startswith("https"):
+            conn.cert_reqs = "CERT_REQUIRED"
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+            return
+        super().cert_verify(conn, url, verify, cert)
+
+
+def get_session(url: str, ssl_verify: bool = True) -> requests.Session:
+    """
+    获取指定端点共享的 requests 会话，首次使用时创建
+
+    连接池本身不做任何重试，连接失败和5xx状态码的重试统一由网关配置的 max_retries 决定，
+    避免两层重试叠加。发送短信的 POST 请求不是幂等的，服务端返回5xx或连接中途断开时短信可能已经发出
+
+    Args:
+        url: 请求地址 (按 scheme://host[:port] 区分会话)
+        ssl_verify: 是否验证SSL证书
+
+    Returns:
+        requests.Session
+    """
+    key = (_endpoint_of(url), ssl_verify)
+    session = _SESSIONS.get(key)
+    if session is not None:
+        return session
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            session.verify = ssl_verify
+            # 验证证书时使用共享的 SSLContext
+            adapter_class = _SharedSSLAdapter if ssl_verify else HTTPAdapter
+            adapter = adapter_class(
+                pool_connections=16,
+                pool_maxsize=64,
+                max_retries=Retry(0, read=False)
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[key] = session
+    return session
+
+
+def prewarm_sessions(targets: List[Tuple[str, bool]], timeout: float = 3.0) -> threading.Thread:
+    """
+    在后台线程中预先建立到各端点的连接 (DNS 解析 + TCP/TLS 握手)
+
+    连接建立在共享会话的连接池中，之后的首次发送可以直接复用；失败时忽略
+
+    Args:
+        targets: (请求地址, 是否验证SSL证书) 列表
+        timeout: 每个端点的超时时间（秒）
+
+    Returns:
+        执行预热的守护线程
+    """
+    # 同一主机只需预热一次
+    endpoints = list(dict.fromkeys((_endpoint_of(url), ssl_verify) for url, ssl_verify in targets))
+
+    def run():
+        for endpoint, ssl_verify in endpoints:
+            try:
+                get_session(endpoint, ssl_verify).head(
+                    endpoint + "/", timeout=timeout, allow_redirects=False
+                )
+            except requests.exceptions.RequestException:
+                pass
+
+    thread = threading.Thread(target=run, name="senweaver-sms-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def close_sessions() -> None:
+    """
+    关闭所有共享的 requests 会话
+    """
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+_FAST_LOOP_INSTALLED = False
+
+
+def install_fast_event_loop() -> bool:
+    """
+    安装 uvloop (Windows 上为 winloop) 事件循环策略，仅执行一次
+
+    未安装对应依赖时保持标准库事件循环
+
+    Returns:
+        是否已使用高性能事件循环
+    """
+    global _FAST_LOOP_INSTALLED
+    if _FAST_LOOP_INSTALLED:
+        return True
+
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(fast_loop.EventLoopPolicy())
+    _FAST_LOOP_INSTALLED = True
+    return True
+
+
+def _import_aiohttp():
+    """
+    导入 aiohttp (可选依赖)
+
+    Raises:
+        ImportError: 未安装 aiohttp 时抛出
+    """
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError("异步发送需要安装 aiohttp: pip install senweaver-sms[async]") from e
+    return aiohttp
+
+
+# aiohttp 会话默认的连接池大小，以及 DNS 解析结果的缓存时间（秒）
+ASYNC_POOL_LIMIT = 200
+ASYNC_DNS_TTL = 300
+
+
+def create_async_session(timeout: float = 5.0, limit: int = ASYNC_POOL_LIMIT):
+    """
+    创建共享的 aiohttp 会话
+
+    网关地址固定，DNS 解析结果缓存 ASYNC_DNS_TTL 秒，大量并发发送时不必反复解析；
+    证书验证使用与同步会话共享的 SSLContext
+
+    Args:
+        timeout: 默认超时时间（秒）
+        limit: 连接池最大连接数
+
+    Returns:
+        aiohttp.ClientSession
+    """
+    aiohttp = _import_aiohttp()
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=limit, ttl_dns_cache=ASYNC_DNS_TTL, ssl=get_ssl_context()
+        ),
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    )
+
+
+# 未显式传入会话时使用的默认 aiohttp 会话，每个事件循环一个 (会话不能跨事件循环使用)
+# 事件循环 -> (会话, 关闭会话的异步生成器)
+_ASYNC_SESSIONS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+async def _close_on_shutdown(loop, session):
+    """
+    事件循环关闭前关闭默认会话
+
+    生成器启动后停在 yield 处，由事件循环在 shutdown_asyncgens() 时 (asyncio.run 退出前) 关闭，
+    执行 finally 中的清理；会话持有事件循环的强引用，不清理时两者都不会被回收
+
+    Args:
+        loop: 会话所属的事件循环
+        session: aiohttp.ClientSession
+    """
+    try:
+        yield
+    finally:
+        entry = _ASYNC_SESSIONS.get(loop)
+        if entry is not None and entry[0] is session:
+            del _ASYNC_SESSIONS[loop]
+        if not session.closed:
+            await session.close()
+
+
+async def get_async_session():
+    """
+    获取当前事件循环的默认 aiohttp 会话，首次使用时创建
+
+    会话在事件循环执行 shutdown_asyncgens() 时自动关闭 (asyncio.run 会调用)；
+    自行管理事件循环时，关闭前应调用 close_async_session()
+
+    Returns:
+        aiohttp.ClientSession
+    """
+    loop = asyncio.get_running_loop()
+    entry = _ASYNC_SESSIONS.get(loop)
+    if entry is not None and not entry[0].closed:
+        return entry[0]
+    session = create_async_session()
+    closer = _close_on_shutdown(loop, session)
+    # 启动生成器，使事件循环开始跟踪它
+    await closer.__anext__()
+    _ASYNC_SESSIONS[loop] = (session, closer)
+    return session
+
+
+async def close_async_session() -> None:
+    """
+    关闭当前事件循环的默认 aiohttp 会话
+    """
+    entry = _ASYNC_SESSIONS.get(asyncio.get_running_loop())
+    if entry is not None:
+        await entry[1].aclose()
+
+
+async def fetch_async(session, request: Dict[str, Any], timeout: float, ssl_verify: bool = True) -> AsyncHTTPResponse:
+    """
+    使用 aiohttp 会话发送请求
+
+    aiohttp 的异常会被转换为对应的 requests 异常，便于网关统一处理
+
+    Args:
+        session: aiohttp.ClientSession
+        request: 网关构建的请求参数 (method, url, params/data/json/headers)
+        timeout: 超时时间（秒）
+        ssl_verify: 是否验证SSL证书
+
+    Returns:
+        响应对象
+    """
+    aiohttp = _import_aiohttp()
+    kwargs = dict(request)
+    method = kwargs.pop("method")
+    url = kwargs.pop("url")
+    if not ssl_verify:
+        kwargs["ssl"] = False
+
+    try:
+        async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as resp:
+            content = await resp.read()
+            return AsyncHTTPResponse(resp.status, content, str(resp.url), resp.reason, resp.charset)
+    except asyncio.TimeoutError as e:
+        raise requests.exceptions.Timeout(f"请求超时: {url}") from e
+    except aiohttp.ClientConnectionError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+    except aiohttp.ClientError as e:
+        raise requests.exceptions.RequestException(str(e)) from e
@@ -0,0 +1,68 @@
+"""
+JSON 序列化工具 - 安装 orjson 时使用 orjson，否则使用标准库
+
+两种实现输出一致的紧凑格式 (无多余空格、不转义非 ASCII 字符)
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> str:
+        """
+        序列化为 JSON 字符串
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON 字符串
+        """
+        return orjson.dumps(obj, option=_OPTIONS).decode("utf-8")
+
+    def dumpb(obj: Any) -> bytes:
+        """
+        序列化为 UTF-8 编码的 JSON 字节串，用作请求体
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON 字节串
+        """
+        return orjson.dumps(obj, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(obj: Any) -> str:
+        """
+        序列化为 JSON 字符串
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON 字符串
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def dumpb(obj: Any) -> bytes:
+        """
+        序列化为 UTF-8 编码的 JSON 字节串，用作请求体
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON 字节串
+        """
+        return dumps(obj).encode("utf-8")
+
+    loads = json.loads
@@ -0,0 +1,54 @@
+"""
+时间格式化工具 - 按秒 (日期按天) 缓存格式化后的 UTC 时间字符串
+
+高频发送时每条请求都调用 strftime 开销不小，而签名用的时间戳精度只到秒
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+# 格式 -> (epoch 秒, 格式化结果)
+_CACHE: Dict[str, Tuple[int, str]] = {}
+
+
+def utc_strftime(fmt: str, timestamp: Optional[float] = None) -> str:
+    """
+    格式化 UTC 时间，同一秒内相同格式直接返回缓存结果
+
+    Args:
+        fmt: strftime 格式，只应包含秒及以上精度的字段
+        timestamp: 时间戳，默认为当前时间
+
+    Returns:
+        格式化后的时间字符串
+    """
+    second = int(time.time() if timestamp is None else timestamp)
+    cached = _CACHE.get(fmt)
+    if cached is not None and cached[0] == second:
+        return cached[1]
+    value = time.strftime(fmt, time.gmtime(second))
+    _CACHE[fmt] = (second, value)
+    return value
+
+
+# (UTC 日序号, YYYY-MM-DD)
+_DATE_CACHE: Tuple[Optional[int], str] = (None, "")
+
+
+def utc_date(timestamp: Optional[float] = None) -> str:
+    """
+    获取 UTC 日期 (YYYY-MM-DD)，同一天内直接返回缓存结果
+
+    Args:
+        timestamp: 时间戳，默认为当前时间
+
+    Returns:
+        日期字符串
+    """
+    global _DATE_CACHE
+    day = int(time.time() if timestamp is None else timestamp) // 86400
+    cached = _DATE_CACHE
+    if cached[0] == day:
+        return cached[1]
+    value = time.strftime("%Y-%m-%d", time.gmtime(day * 86400))
+    _DATE_CACHE = (day, value)
+    return value
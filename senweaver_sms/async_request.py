@@ -0,0 +1,406 @@
+"""
+异步短信请求类 - 基于 aiohttp 的异步发送入口
+"""
+import asyncio
+from typing import Dict, Any, List, Union, Optional
+
+from .config import SMSConfig
+from .message import Message
+from .phone_number import PhoneNumber
+from .request import SMSRequest
+from .response import SMSResponse, SMSBatchResponse
+from ._http import create_async_session
+
+
+class AsyncSMSRequest(SMSRequest):
+    """
+    异步短信请求类
+
+    所有网关调用共享同一个 aiohttp 会话，复用 TCP/TLS 连接；
+    使用完毕后需调用 aclose() 或通过 async with 使用
+    """
+
+    def __init__(self, config: SMSConfig, timeout: float = 5.0):
+        """
+        初始化
+
+        Args:
+            config: 短信配置
+            timeout: 会话默认超时时间（秒），各网关仍使用自身配置的超时
+        """
+        super().__init__(config)
+        self._timeout = timeout
+        self._session = None
+
+    def _get_session(self):
+        """
+        获取共享的 aiohttp 会话，首次使用时创建
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            self._session = create_async_session(timeout=self._timeout)
+        return self._session
+
+    async def send_async(self,
+                         to: Union[str, PhoneNumber],
+                         content: Union[str, Message] = None,
+                         template: str = None,
+                         data: Dict[str, Any] = None,
+                         gateways: List[str] = None,
+                         strategy: str = None) -> SMSResponse:
+        """
+        异步发送短信
+
+        Args:
+            to: 接收人手机号
+            content: 短信内容，与template二选一；也可以传入预先构建的 Message 对象
+            template: 模板ID，与content二选一
+            data: 模板参数
+            gateways: 使用的网关列表，不指定则使用配置中的默认网关
+            strategy: 使用的策略，不指定则使用配置中的默认策略
+
+        Returns:
+            发送结果
+        """
+        phone = to if isinstance(to, PhoneNumber) else PhoneNumber(to)
+
+        message = self._make_message(content, template, data)
+
+        selected_gateways = self._select_gateways(message, gateways, strategy)
+        return await self._send_message_async(phone, message, selected_gateways)
+
+    async def _send_message_async(self, to: PhoneNumber, message: Message, gateway_names: List[str]) -> SMSResponse:
+        """
+        使用指定网关异步发送消息
+
+        Args:
+            to: 接收人手机号
+            message: 消息对象
+            gateway_names: 网关名称列表
+
+        Returns:
+            发送结果
+
+        Raises:
+            NoGatewayAvailableException: 所有网关都发送失败时抛出
+        """
+        session = self._get_session()
+        hedge_delay = self.config.hedge_delay
+        if hedge_delay is not None and len(gateway_names) > 1:
+            return await self._send_message_hedged_async(to, message, gateway_names, hedge_delay, session)
+
+        responses = SMSBatchResponse()
+
+        for name in gateway_names:
+            response = await self._send_with_gateway_async(name, to, message, session)
+            if response is None:
+                continue
+            responses.add_response(response)
+
+            if response.is_success:
+                return response
+
+        return self._resolve_failure(responses)
+
+    async def _send_message_hedged_async(self, to: PhoneNumber, message: Message, gateway_names: List[str],
+                                         delay: float, session) -> SMSResponse:
+        """
+        异步对冲发送：按顺序启动网关，前一个网关失败或超过 delay 秒未返回时启动下一个，
+        返回第一个成功的响应，其余仍在进行的请求被取消
+
+        Args:
+            to: 接收人手机号
+            message: 消息对象
+            gateway_names: 网关名称列表
+            delay: 启动下一个网关前的等待时间（秒）
+            session: 共享的 aiohttp.ClientSession
+
+        Returns:
+            发送结果
+
+        Raises:
+            NoGatewayAvailableException: 所有网关都发送失败时抛出
+        """
+        responses = SMSBatchResponse()
+        names = iter(gateway_names)
+        pending = set()
+
+        def launch_next() -> bool:
+            for name in names:
+                pending.add(asyncio.ensure_future(self._send_with_gateway_async(name, to, message, session)))
+                return True
+            return False
+
+        try:
+            exhausted = not launch_next()
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=None if exhausted else delay,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    exhausted = not launch_next()
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    response = task.result()
+                    if response is None:
+                        continue
+                    responses.add_response(response)
+                    if response.is_success:
+                        return response
+
+                if not exhausted:
+                    exhausted = not launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return self._resolve_failure(responses)
+
+    async def _send_with_gateway_async(self, name: str, to: PhoneNumber, message: Message, session) -> Optional[SMSResponse]:
+        """
+        使用单个网关异步发送消息
+
+        Args:
+            name: 网关名称
+            to: 接收人手机号
+            message: 消息对象
+            session: 共享的 aiohttp.ClientSession
+
+        Returns:
+            发送结果，网关未配置时返回None
+        """
+        try:
+            gateway = self._get_gateway(name)
+            config = self.config.get_gateway(name)
+
+            if not config:
+                return None
+
+            breaker = self._get_breaker(name)
+            if not breaker.allow():
+                return self._circuit_open_response(name, to)
+
+            response = await gateway.send_async(to, message, config, session)
+            breaker.record(response)
+            return response
+        except Exception as e:
+            return SMSResponse.failed(
+                gateway=name,
+                phone_number=to.get_number(),
+                error_code="UNKNOWN_ERROR",
+                error_message=str(e)
+            )
+
+    async def send_many_async(self,
+                              recipients: List[Union[str, PhoneNumber]],
+                              *,
+                              template: Optional[str] = None,
+                              content: Union[str, Message, None] = None,
+                              data: Optional[Dict[str, Any]] = None,
+                              gateways: Optional[List[str]] = None,
+                              strategy: Optional[str] = None,
+                              concurrency: int = 32) -> SMSBatchResponse:
+        """
+        并发发送同一条短信给多个接收人
+
+        Args:
+            recipients: 接收人手机号列表
+            template: 模板ID
+            content: 短信内容或消息对象
+            data: 模板参数
+            gateways: 使用的网关列表
+            strategy: 使用的策略
+            concurrency: 同时进行的最大请求数
+
+        Returns:
+            批量发送结果，顺序与 recipients 一致
+        """
+        # 所有接收人共用同一个消息对象
+        message = self._make_message(content, template, data)
+
+        # 格式错误的号码直接记为失败，不影响其他号码
+        responses: List[Optional[SMSResponse]] = [None] * len(recipients)
+        phones, positions = [], []
+        for i, to in enumerate(recipients):
+            try:
+                phones.append(to if isinstance(to, PhoneNumber) else PhoneNumber(to))
+            except Exception as e:
+                responses[i] = self._batch_failed_response(to, e)
+            else:
+                positions.append(i)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        results = None
+        if len(phones) > 1:
+            results = await self._send_bulk_async(phones, message, gateways, strategy, semaphore)
+
+        if results is None:
+            async def send_one(phone: PhoneNumber) -> SMSResponse:
+                async with semaphore:
+                    return await self._send_one_async(phone, message, gateways, strategy)
+
+            results = await asyncio.gather(*[send_one(phone) for phone in phones], return_exceptions=True)
+
+        # 单个发送失败不影响其他发送
+        for i, phone, result in zip(positions, phones, results):
+            responses[i] = self._batch_failed_response(phone, result) if isinstance(result, BaseException) else result
+        return SMSBatchResponse(responses)
+
+    async def batch_send_async(self,
+                               to_list: List[Union[str, PhoneNumber]],
+                               content: Union[str, Message] = None,
+                               template: str = None,
+                               data: Dict[str, Any] = None,
+                               gateways: List[str] = None,
+                               strategy: str = None,
+                               concurrency: int = 32) -> SMSBatchResponse:
+        """
+        batch_send 的异步版本，参数与 batch_send 一致
+
+        Args:
+            to_list: 接收人手机号列表
+            content: 短信内容或消息对象
+            template: 模板ID
+            data: 模板参数
+            gateways: 使用的网关列表
+            strategy: 使用的策略
+            concurrency: 同时进行的最大请求数
+
+        Returns:
+            批量发送结果，顺序与 to_list 一致
+        """
+        return await self.send_many_async(
+            to_list, content=content, template=template, data=data,
+            gateways=gateways, strategy=strategy, concurrency=concurrency
+        )
+
+    async def _send_bulk_async(self,
+                               phones: List[PhoneNumber],
+                               message: Message,
+                               gateways: Optional[List[str]],
+                               strategy: Optional[str],
+                               semaphore: asyncio.Semaphore) -> Optional[List[Any]]:
+        """
+        首选网关支持批量接口时，按 bulk_limit 分片调用批量接口
+
+        批量接口发送失败的号码继续使用其余网关逐个发送
+
+        Args:
+            phones: 接收人手机号列表
+            message: 消息对象
+            gateways: 使用的网关列表
+            strategy: 使用的策略
+            semaphore: 限制并发请求数的信号量
+
+        Returns:
+            每个号码的发送结果 (SMSResponse 或异常)；首选网关不支持批量接口时返回 None
+        """
+        try:
+            selected_gateways = self._select_gateways(message, gateways, strategy)
+            name = selected_gateways[0]
+            gateway = self._get_gateway(name)
+            config = self.config.get_gateway(name)
+        except Exception:
+            return None
+
+        if not config or not gateway.supports_bulk or not self._get_breaker(name).allow():
+            return None
+
+        session = self._get_session()
+        limit = gateway.bulk_limit
+
+        async def send_chunk(chunk: List[PhoneNumber]) -> List[SMSResponse]:
+            async with semaphore:
+                return await gateway.send_bulk_async(chunk, message, config, session)
+
+        chunk_results = await asyncio.gather(*[
+            send_chunk(phones[i:i + limit]) for i in range(0, len(phones), limit)
+        ])
+        results = [response for chunk in chunk_results for response in chunk]
+
+        # 每个分片是一次请求，按分片的首个结果更新熔断器
+        breaker = self._get_breaker(name)
+        for chunk in chunk_results:
+            breaker.record(chunk[0])
+
+        fallback_gateways = selected_gateways[1:]
+        if fallback_gateways:
+            failed = [i for i, response in enumerate(results) if not response.is_success]
+
+            async def send_fallback(phone: PhoneNumber) -> SMSResponse:
+                async with semaphore:
+                    return await self._send_message_async(phone, message, fallback_gateways)
+
+            retried = await asyncio.gather(*[send_fallback(phones[i]) for i in failed], return_exceptions=True)
+            for i, response in zip(failed, retried):
+                results[i] = response
+
+        return results
+
+    def send_many(self, recipients: List[Union[str, PhoneNumber]], **kwargs) -> SMSBatchResponse:
+        """
+        send_many_async 的同步封装
+
+        在没有运行中事件循环的线程里使用，发送完成后关闭会话
+
+        Args:
+            recipients: 接收人手机号列表
+            **kwargs: 同 send_many_async
+
+        Returns:
+            批量发送结果
+
+        Raises:
+            RuntimeError: 在运行中的事件循环内调用时抛出
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._send_many_and_close(recipients, **kwargs))
+        raise RuntimeError("当前线程已有运行中的事件循环，请使用 await send_many_async(...)")
+
+    async def _send_many_and_close(self, recipients: List[Union[str, PhoneNumber]], **kwargs) -> SMSBatchResponse:
+        """
+        发送后关闭会话 (会话与事件循环绑定，asyncio.run 结束后不可复用)
+        """
+        try:
+            return await self.send_many_async(recipients, **kwargs)
+        finally:
+            await self.aclose()
+
+    async def _send_one_async(self,
+                              to: PhoneNumber,
+                              message: Message,
+                              gateways: Optional[List[str]] = None,
+                              strategy: Optional[str] = None) -> SMSResponse:
+        """
+        按策略选择网关并异步发送给单个接收人
+
+        Args:
+            to: 接收人手机号
+            message: 消息对象
+            gateways: 使用的网关列表
+            strategy: 使用的策略
+
+        Returns:
+            发送结果
+        """
+        selected_gateways = self._select_gateways(message, gateways, strategy)
+        return await self._send_message_async(to, message, selected_gateways)
+
+    async def aclose(self) -> None:
+        """
+        关闭共享的 aiohttp 会话
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> 'AsyncSMSRequest':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
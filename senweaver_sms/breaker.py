@@ -0,0 +1,72 @@
+"""
+熔断器 - 连续请求失败的网关在一段时间内直接跳过
+"""
+import time
+from collections import deque
+
+from .response import SMSResponse
+
+
+# 视为网关不可用的错误代码 (网络/HTTP层面的失败，不含号码、模板等业务错误)
+TRANSPORT_ERROR_CODES = frozenset({"REQUEST_ERROR", "TIMEOUT", "CONNECTION_ERROR"})
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    连续 failure_threshold 次请求失败，或最近 window 次请求中失败比例达到 failure_rate 时打开，
+    reset_timeout 秒内不再尝试该网关；超时后放行请求，成功则恢复，再次失败则立即重新打开。
+    失败比例可以识别成功与失败交替出现、连续失败次数始终达不到阈值的不稳定网关
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 window: int = 20, failure_rate: float = 0.5):
+        """
+        初始化
+
+        Args:
+            failure_threshold: 打开熔断器所需的连续失败次数
+            reset_timeout: 熔断持续时间（秒）
+            window: 统计失败比例的最近请求数
+            failure_rate: 打开熔断器的失败比例，最近请求数达到 window 后才生效
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_rate = failure_rate
+        self._failures = 0
+        self._open_until = 0.0
+        # 最近的请求结果，True 表示请求失败
+        self._outcomes = deque(maxlen=window)
+
+    def allow(self) -> bool:
+        """
+        是否允许请求
+
+        Returns:
+            熔断器未打开时返回True
+        """
+        return time.monotonic() >= self._open_until
+
+    def record(self, response: SMSResponse) -> None:
+        """
+        根据发送结果更新熔断器状态
+
+        Args:
+            response: 网关返回的响应
+        """
+        outcomes = self._outcomes
+        if response.is_success:
+            self._failures = 0
+            self._open_until = 0.0
+            outcomes.append(False)
+        elif response.error and response.error.code in TRANSPORT_ERROR_CODES:
+            self._failures += 1
+            outcomes.append(True)
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.reset_timeout
+            elif len(outcomes) == outcomes.maxlen and sum(outcomes) >= self.failure_rate * len(outcomes):
+                self._open_until = time.monotonic() + self.reset_timeout
+                # 清空历史重新统计；恢复后的首次请求失败时按连续失败立即重新打开
+                outcomes.clear()
+                self._failures = self.failure_threshold - 1
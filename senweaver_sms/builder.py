@@ -1,10 +1,22 @@
 """
 短信请求构建器 - 便于构建和配置短信服务
 """
+import sys
+import warnings
 from typing import Dict, Any, List, Union, Callable, Optional
 
-from .config import SMSConfig, GatewayConfig
+from .config import SMSConfig, GatewayConfig, _GATEWAY_FIELDS
+from .message import Message
 from .request import SMSRequest
+from .async_request import AsyncSMSRequest
+from ._http import install_fast_event_loop
+
+
+# 内置网关名称，驻留后作为配置字典的键，查找时可直接比较对象身份
+_NAMES = {n: sys.intern(n) for n in (
+    "aliyun", "baidu", "ctyun", "huawei", "huyi", "juhe",
+    "mas", "qcloud", "qiniu", "smsbao", "ucloud", "yunpian",
+)}
 
 
 class SMSBuilder:
@@ -21,7 +33,10 @@ class SMSBuilder:
         self._default_gateway = None
         self._strategy = "order"
         self._timeout = 5.0
+        self._max_retries = None
         self._debug = False
+        self._prewarm = False
+        self._hedge_delay = None
     
     @classmethod
     def builder(cls) -> 'SMSBuilder':
@@ -77,38 +92,40 @@ class SMSBuilder:
         Returns:
             构建器实例
         """
+        # 用户传入的名称 (如读取自配置文件) 同样驻留
+        name = sys.intern(name)
+        
         # 使用 existing config or create new one
-        existing_config = self._gateway_configs.get(name, GatewayConfig())
+        existing_config = self._gateway_configs.get(name)
+        if existing_config is None:
+            existing_config = GatewayConfig()
         
         # Update fields if provided
-        if app_id is not None: existing_config.app_id = app_id
-        if app_key is not None: existing_config.app_key = app_key
-        if app_secret is not None: existing_config.app_secret = app_secret
-        if sign is not None: existing_config.sign = sign
-        if region is not None: existing_config.region = region
-        if version is not None: existing_config.version = version
+        fields = (
+            ("app_id", app_id),
+            ("app_key", app_key),
+            ("app_secret", app_secret),
+            ("sign", sign),
+            ("region", region),
+            ("version", version),
+            ("invoke_id", invoke_id),
+            ("signature_id", signature_id),
+            ("channel", channel),
+            ("endpoint", endpoint),
+            ("callback_url", callback_url),
+            ("project_id", project_id),
+        )
+        for field_name, value in fields:
+            if value is not None:
+                setattr(existing_config, field_name, value)
         existing_config.ssl_verify = ssl_verify # Always update ssl_verify
-        if invoke_id is not None: existing_config.invoke_id = invoke_id
-        if signature_id is not None: existing_config.signature_id = signature_id
-        if channel is not None: existing_config.channel = channel
-        if endpoint is not None: existing_config.endpoint = endpoint
-        if callback_url is not None: existing_config.callback_url = callback_url
-        if project_id is not None: existing_config.project_id = project_id
-        
-        # Set timeout from builder's current setting
-        existing_config.timeout = self._timeout
         
         # Add any other options (less preferred)
-        if other_options:
-             # Update existing config with other options
-             config_dict = existing_config.to_dict()
-             config_dict.update(other_options)
-             # Recreate GatewayConfig to handle potential new fields not directly supported
-             # Note: This might overwrite explicit fields if keys clash
-             try:
-                 existing_config = GatewayConfig(**config_dict)
-             except TypeError as e:
-                 print(f"Warning: Failed to update GatewayConfig with other_options for {name}: {e}")
+        for key, value in other_options.items():
+            if key in _GATEWAY_FIELDS:
+                setattr(existing_config, key, value)
+            else:
+                warnings.warn(f"Unknown gateway option for {name}: {key}", stacklevel=2)
 
         self._gateway_configs[name] = existing_config
         return self
@@ -116,42 +133,42 @@ class SMSBuilder:
     # --- Specific Gateway Helper Methods --- 
     
     def aliyun(self, access_key_id: str, access_key_secret: str, sign_name: str, region: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="aliyun", app_id=access_key_id, app_key=access_key_secret, sign=sign_name, region=region)
+        return self.gateway(name=_NAMES["aliyun"], app_id=access_key_id, app_key=access_key_secret, sign=sign_name, region=region)
     
     def baidu(self, access_key: str, secret_key: str, invoke_id: str, signature_id: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="baidu", app_id=access_key, app_key=secret_key, invoke_id=invoke_id, signature_id=signature_id)
+        return self.gateway(name=_NAMES["baidu"], app_id=access_key, app_key=secret_key, invoke_id=invoke_id, signature_id=signature_id)
         
     def ctyun(self, access_key: str, secret_key: str, sign: str) -> 'SMSBuilder':
-        return self.gateway(name="ctyun", app_id=access_key, app_key=secret_key, sign=sign)
+        return self.gateway(name=_NAMES["ctyun"], app_id=access_key, app_key=secret_key, sign=sign)
 
     def huawei(self, app_key: str, app_secret: str, channel: str, sign: Optional[str] = None, 
                  endpoint: Optional[str] = None, callback_url: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="huawei", app_id=app_key, app_key=app_secret, 
+        return self.gateway(name=_NAMES["huawei"], app_id=app_key, app_key=app_secret, 
                             channel=channel, sign=sign, 
                             endpoint=endpoint, callback_url=callback_url)
                             
     def huyi(self, account: str, password: str) -> 'SMSBuilder':
-        return self.gateway(name="huyi", app_id=account, app_key=password)
+        return self.gateway(name=_NAMES["huyi"], app_id=account, app_key=password)
     
     def juhe(self, key: str) -> 'SMSBuilder':
-        return self.gateway(name="juhe", app_id="", app_key=key)
+        return self.gateway(name=_NAMES["juhe"], app_id="", app_key=key)
         
     def qcloud(self, sdk_app_id: str, secret_id: str, secret_key: str, sign_name: str, 
                  version: Optional[str] = None, region: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="qcloud", app_id=sdk_app_id, app_key=secret_id, app_secret=secret_key, 
+        return self.gateway(name=_NAMES["qcloud"], app_id=sdk_app_id, app_key=secret_id, app_secret=secret_key, 
                             sign=sign_name, version=version, region=region)
                             
     def qiniu(self, access_key: str, secret_key: str) -> 'SMSBuilder':
-        return self.gateway(name="qiniu", app_id=access_key, app_key=secret_key)
+        return self.gateway(name=_NAMES["qiniu"], app_id=access_key, app_key=secret_key)
 
     def smsbao(self, username: str, password: str, sign: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="smsbao", app_id=username, app_key=password, sign=sign)
+        return self.gateway(name=_NAMES["smsbao"], app_id=username, app_key=password, sign=sign)
         
     def ucloud(self, public_key: str, private_key: str, sig_content: str, project_id: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="ucloud", app_id=public_key, app_key=private_key, sign=sig_content, project_id=project_id)
+        return self.gateway(name=_NAMES["ucloud"], app_id=public_key, app_key=private_key, sign=sig_content, project_id=project_id)
         
     def yunpian(self, api_key: str, sign: Optional[str] = None) -> 'SMSBuilder':
-        return self.gateway(name="yunpian", app_id="", app_key=api_key, sign=sign)
+        return self.gateway(name=_NAMES["yunpian"], app_id="", app_key=api_key, sign=sign)
         
     def mas(self, ap_id: str, secret_key: str, ec_name: str, sign: str, add_serial: str = "", endpoint: str = "http://112.35.1.155:1992/sms/norsubmit") -> 'SMSBuilder':
         """
@@ -168,7 +185,7 @@ class SMSBuilder:
         Returns:
             构建器实例
         """
-        return self.gateway(name="mas", app_id=ap_id, app_key=secret_key, app_secret=ec_name, sign=sign, 
+        return self.gateway(name=_NAMES["mas"], app_id=ap_id, app_key=secret_key, app_secret=ec_name, sign=sign, 
                            add_serial=add_serial, endpoint=endpoint)
 
     # --- General Configuration Methods --- 
@@ -199,9 +216,24 @@ class SMSBuilder:
         self._strategy = strategy
         return self
     
+    def hedge(self, delay: float) -> 'SMSBuilder':
+        """
+        启用对冲发送：网关超过 delay 秒未返回时，不等待结果直接并发尝试下一个网关
+        
+        可以缩短网关故障时的等待时间，但前一个网关之后仍可能发送成功，接收人可能收到重复短信
+        
+        Args:
+            delay: 启动下一个网关前的等待时间（秒）
+            
+        Returns:
+            构建器实例
+        """
+        self._hedge_delay = delay
+        return self
+    
     def timeout(self, timeout: float) -> 'SMSBuilder':
         """
-        设置全局超时时间 (会覆盖已添加网关的超时设置)
+        设置全局超时时间 (在 build 时应用到所有网关，与调用顺序无关)
         
         Args:
             timeout: 超时时间（秒）
@@ -210,9 +242,22 @@ class SMSBuilder:
             构建器实例
         """
         self._timeout = timeout
-        # 更新已存在网关的超时设置
-        for config in self._gateway_configs.values():
-            config.timeout = timeout
+        return self
+    
+    def retries(self, max_retries: int) -> 'SMSBuilder':
+        """
+        设置全局重试次数 (在 build 时应用到所有网关)
+        
+        只在连接失败或服务端返回5xx时按指数退避重试，读取超时和4xx错误不重试；
+        发送请求不是幂等的，服务端返回5xx时短信可能已经发出，开启重试可能导致重复发送
+        
+        Args:
+            max_retries: 最大重试次数
+            
+        Returns:
+            构建器实例
+        """
+        self._max_retries = max_retries
         return self
     
     def debug(self, debug: bool = True) -> 'SMSBuilder':
@@ -228,6 +273,38 @@ class SMSBuilder:
         self._debug = debug
         return self
     
+    def prewarm(self, enabled: bool = True) -> 'SMSBuilder':
+        """
+        设置 build 时是否在后台预先连接各网关端点 (默认关闭，构建时不会产生网络连接)
+        
+        Args:
+            enabled: 是否预热连接
+            
+        Returns:
+            构建器实例
+        """
+        self._prewarm = enabled
+        return self
+    
+    def message(self,
+                template: Optional[str] = None,
+                content: Optional[str] = None,
+                data: Optional[Dict[str, Any]] = None) -> Message:
+        """
+        创建可重复使用的消息对象
+        
+        同一条短信发送给多个号码时，可以将返回的消息对象直接传给 send 的 content 参数
+        
+        Args:
+            template: 模板ID
+            content: 短信内容
+            data: 模板参数
+            
+        Returns:
+            消息对象
+        """
+        return Message(content=content, template=template, data=data or {})
+    
     def build(self) -> SMSRequest:
         """
         构建短信请求对象
@@ -235,17 +312,50 @@ class SMSBuilder:
         Returns:
             短信请求对象
         """
+        request = SMSRequest(self._build_config())
+        if self._prewarm:
+            request.prewarm()
+        return request
+    
+    def build_async(self, fast_loop: bool = True) -> AsyncSMSRequest:
+        """
+        构建异步短信请求对象
+        
+        需要安装 aiohttp (pip install senweaver-sms[async])；
+        安装了 uvloop/winloop (pip install senweaver-sms[fast]) 时会设置为默认事件循环策略
+        
+        Args:
+            fast_loop: 是否尝试安装 uvloop/winloop 事件循环
+            
+        Returns:
+            异步短信请求对象
+        """
+        if fast_loop:
+            install_fast_event_loop()
+        return AsyncSMSRequest(self._build_config(), timeout=self._timeout)
+    
+    def _build_config(self) -> SMSConfig:
+        """
+        创建短信配置
+        
+        Returns:
+            短信配置
+        """
         # 至少需要一个网关
         if not self._gateway_configs:
             raise ValueError("至少需要配置一个网关")
         
+        # 统一应用超时和重试设置
+        for config in self._gateway_configs.values():
+            config.timeout = self._timeout
+            if self._max_retries is not None:
+                config.max_retries = self._max_retries
+        
         # 创建配置
-        config = SMSConfig(
+        return SMSConfig(
             gateways=self._gateway_configs,
             default_gateway=self._default_gateway,
             default_strategy=self._strategy,
-            debug=self._debug
+            debug=self._debug,
+            hedge_delay=self._hedge_delay
         )
-        
-        # 创建请求对象
-        return SMSRequest(config)
\ No newline at end of file
@@ -1,11 +1,14 @@
 """
 短信服务配置类 - 统一配置管理
 """
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+import dataclasses
+from dataclasses import field
+from typing import Dict, List, Optional, Any, Union, Tuple, Sequence
 
+from ._compat import slotted_dataclass
 
-@dataclass
+
+@slotted_dataclass
 class GatewayConfig:
     """
     网关配置类
@@ -24,6 +27,7 @@ class GatewayConfig:
     # --- 通用高级配置 ---
     timeout: float = 5.0                # 请求超时时间(秒)
     ssl_verify: bool = True             # 是否验证SSL证书
+    max_retries: int = 0                # 连接失败或服务端5xx错误时的最大重试次数 (发送请求不是幂等的，重试可能重复发送)
     
     # --- 特定网关配置 ---
     # 百度云 (baidu)
@@ -41,12 +45,28 @@ class GatewayConfig:
     # 移动mas (mas)
     add_serial: Optional[str] = None     # 扩展码 (可选, 默认为空字符串)
     
+    # --- 内部缓存 ---
+    # (网关类, 缓存项) -> 网关由配置得到的结果，如验证结果、请求地址、推导出的固定参数；
+    # 按网关类区分，同一配置用于不同网关时互不影响
+    _cache: Dict[Tuple[type, str], Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """
         初始化后的处理，验证必要的配置
         """
         pass  # 通用配置不做强制验证，由各网关自行验证
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        修改配置字段时清除网关缓存，之后的发送按新配置重新验证和计算
+        """
+        object.__setattr__(self, name, value)
+        if name[0] != "_":
+            # 初始化时缓存字段还未赋值
+            cache = getattr(self, "_cache", None)
+            if cache:
+                cache.clear()
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         将配置转换为字典 (主要用于调试或序列化)
@@ -54,17 +74,14 @@ class GatewayConfig:
         Returns:
             配置字典
         """
-        result = {}
-        # Use dataclasses.fields to iterate through fields
-        import dataclasses
-        for f in dataclasses.fields(self.__class__):
-            value = getattr(self, f.name)
-            if value is not None:
-                result[f.name] = value
-        return result
+        return {name: value for name in _GATEWAY_FIELDS if (value := getattr(self, name)) is not None}
+
+
+# GatewayConfig 的字段名 (不含内部缓存字段)，避免每次调用 to_dict 时重新遍历 dataclasses.fields
+_GATEWAY_FIELDS = tuple(f.name for f in dataclasses.fields(GatewayConfig) if f.init)
 
 
-@dataclass
+@slotted_dataclass
 class SMSConfig:
     """
     短信服务主配置类
@@ -73,6 +90,10 @@ class SMSConfig:
     default_gateway: Optional[str] = None      # 默认网关
     default_strategy: str = "order"            # 默认策略
     debug: bool = False                        # 调试模式
+    hedge_delay: Optional[float] = None        # 对冲发送间隔（秒），None 时逐个网关依次尝试
+    
+    # --- 内部缓存 ---
+    _configs_by_names: Dict[Tuple[str, ...], Dict[str, GatewayConfig]] = field(default_factory=dict, init=False, repr=False, compare=False)  # 网关名称列表 -> 网关配置字典
     
     def __post_init__(self):
         """
@@ -83,7 +104,18 @@ class SMSConfig:
         
         # 如果未指定默认网关，使用第一个网关
         if not self.default_gateway and self.gateways:
-            self.default_gateway = next(iter(self.gateways.keys()))
+            self.default_gateway = next(iter(self.gateways))
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        替换网关配置字典时清除按名称缓存的网关配置
+        """
+        object.__setattr__(self, name, value)
+        if name == "gateways":
+            # 初始化时缓存字段还未赋值
+            configs_by_names = getattr(self, "_configs_by_names", None)
+            if configs_by_names:
+                configs_by_names.clear()
     
     def add_gateway(self, name: str, config: GatewayConfig) -> 'SMSConfig':
         """
@@ -97,6 +129,7 @@ class SMSConfig:
             更新后的配置对象
         """
         self.gateways[name] = config
+        self._configs_by_names.clear()
         return self
     
     def get_gateway(self, name: str) -> Optional[GatewayConfig]:
@@ -135,4 +168,38 @@ class SMSConfig:
         if name not in self.gateways:
             raise ValueError(f"网关 {name} 不存在")
         self.default_gateway = name
-        return self
\ No newline at end of file
+        return self
+    
+    def get_send_order(self) -> Tuple[str, ...]:
+        """
+        获取未指定网关时的发送顺序
+        
+        有默认网关时只使用默认网关，否则按配置顺序使用所有网关；
+        每次按当前配置计算，直接修改 default_gateway 或 gateways 后立即生效
+        
+        Returns:
+            网关名称元组
+        """
+        default_gateway = self.default_gateway
+        if default_gateway:
+            return (default_gateway,) if default_gateway in self.gateways else ()
+        return tuple(self.gateways)
+    
+    def get_gateway_configs(self, names: Sequence[str]) -> Dict[str, GatewayConfig]:
+        """
+        获取指定网关的配置字典，按名称顺序排列并跳过未配置的网关
+        
+        结果按名称列表缓存，通过 add_gateway 修改配置时自动失效
+        
+        Args:
+            names: 网关名称列表
+            
+        Returns:
+            网关配置字典 (调用方不应修改)
+        """
+        key = tuple(names)
+        configs = self._configs_by_names.get(key)
+        if configs is None:
+            configs = {name: self.gateways[name] for name in key if self.gateways.get(name)}
+            self._configs_by_names[key] = configs
+        return configs
\ No newline at end of file
@@ -1,4 +1,5 @@
 """Base exceptions for SenWeaver SMS."""
+from functools import cached_property
 from typing import Any, Dict, Optional
 
 
@@ -24,22 +25,44 @@ class GatewayErrorException(Exception):
     当短信网关返回错误或请求失败时抛出
     """
     
-    def __init__(self, message: str, code: Any = None, exception: Optional[Exception] = None, data: Optional[Dict[str, Any]] = None):
+    def __init__(self, message: Optional[str] = None, code: Any = None, exception: Optional[BaseException] = None, data: Optional[Dict[str, Any]] = None):
         """
         初始化
         
         Args:
-            message: 错误消息
+            message: 错误消息，为None时在首次访问时由原始异常生成
             code: 错误代码
             exception: 原始异常
             data: 附加数据
         """
-        self.message = message
+        if message is not None:
+            self.message = message
         self.code = code
         self.exception = exception
         self.data = data or {}
         
-        super().__init__(message)
+        super().__init__(message if message is not None else exception)
+    
+    @classmethod
+    def wrap(cls, exception: BaseException, code: Any) -> 'GatewayErrorException':
+        """
+        包装原始异常，错误消息延迟到首次访问时才格式化
+        
+        Args:
+            exception: 原始异常
+            code: 错误代码
+            
+        Returns:
+            网关异常
+        """
+        return cls(code=code, exception=exception)
+    
+    @cached_property
+    def message(self) -> str:
+        """
+        错误消息 (未显式指定时取原始异常的字符串表示)
+        """
+        return str(self.exception) if self.exception is not None else ""
     
     def __str__(self) -> str:
         """
@@ -78,16 +101,28 @@ class NoGatewayAvailableException(Exception):
     当所有配置的网关都无法发送短信时抛出
     """
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None, results: Optional[Dict[str, Dict[str, Any]]] = None):
         """
         初始化
         
         Args:
             message: 错误消息
             details: 详细错误信息，通常包含每个网关的具体错误
+            results: 各网关的尝试结果，格式为 {网关名: {"status": ..., "exception": ...}}
         """
         self.message = message
         self.details = details or {}
+        self.results = results if results is not None else self.details.get("results") or {}
+        
+        # 各网关的异常只整理一次，details 中没有 errors 时从 results 中提取
+        errors = self.details.get("errors")
+        if errors is None:
+            errors = {
+                gateway: result.get('exception')
+                for gateway, result in self.results.items()
+                if result.get('status') == 'failure' and result.get('exception')
+            }
+        self._exceptions = errors
         
         super().__init__(message)
     
@@ -119,11 +154,7 @@ class NoGatewayAvailableException(Exception):
         Returns:
             Dict[str, Exception]: Exceptions from all gateway attempts
         """
-        return {
-            gateway: result.get('exception')
-            for gateway, result in self.results.items()
-            if result.get('status') == 'failure' and result.get('exception')
-        }
+        return self._exceptions
 
     def get_exception(self, gateway: str) -> Exception:
         """
@@ -135,7 +166,7 @@ class NoGatewayAvailableException(Exception):
         Returns:
             Exception: The exception for the gateway
         """
-        return self.get_exceptions().get(gateway)
+        return self._exceptions.get(gateway)
 
     def get_last_exception(self) -> Exception:
         """
@@ -144,10 +175,7 @@ class NoGatewayAvailableException(Exception):
         Returns:
             Exception: The last exception
         """
-        exceptions = self.get_exceptions()
-        if exceptions:
-            return list(exceptions.values())[-1]
-        return None
+        return next(reversed(self._exceptions.values()), None)
 
 class NoGatewaySelectedException(Exception):
     """
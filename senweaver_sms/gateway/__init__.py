@@ -1,20 +1,44 @@
 """
 Gateway module for SenWeaver SMS.
+
+网关模块在首次访问对应的类时才导入，避免 import senweaver_sms 时加载所有网关
 """
+import importlib
 
 from .base import BaseGateway
-from .aliyun import AliyunGateway
-from .baidu import BaiduGateway
-from .ctyun import CtyunGateway
-from .huawei import HuaweiGateway
-from .huyi import HuyiGateway
-from .juhe import JuheGateway
-from .mas import MasGateway
-from .qcloud import QcloudGateway
-from .qiniu import QiniuGateway
-from .smsbao import SmsBaoGateway
-from .ucloud import UcloudGateway
-from .yunpian import YunpianGateway
+
+# 网关类名 -> 所在模块
+_GATEWAY_MODULES = {
+    'AliyunGateway': 'aliyun',
+    'BaiduGateway': 'baidu',
+    'CtyunGateway': 'ctyun',
+    'HuaweiGateway': 'huawei',
+    'HuyiGateway': 'huyi',
+    'JuheGateway': 'juhe',
+    'MasGateway': 'mas',
+    'QcloudGateway': 'qcloud',
+    'QiniuGateway': 'qiniu',
+    'SmsBaoGateway': 'smsbao',
+    'UcloudGateway': 'ucloud',
+    'YunpianGateway': 'yunpian',
+}
+
+# 网关名称 (模块名) -> 网关类名，供按名称创建网关时直接查找
+_GATEWAY_CLASS_NAMES = {module_name: class_name for class_name, module_name in _GATEWAY_MODULES.items()}
+
+
+def __getattr__(name):
+    module_name = _GATEWAY_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_GATEWAY_MODULES))
+
 
 __all__ = [
     'BaseGateway',
@@ -30,4 +54,4 @@ __all__ = [
     'SmsBaoGateway',
     'UcloudGateway',
     'YunpianGateway',
-]
\ No newline at end of file
+]
@@ -1,18 +1,23 @@
-import json
 import hmac
-import uuid
+import secrets
 import base64
-import datetime
-import requests
 from hashlib import sha1
-from typing import Dict, Any, Optional
+from heapq import merge
+from functools import partial
+from typing import Dict, Any, List, Callable
+from urllib.parse import quote
 
 from ..phone_number import PhoneNumber
 from ..message import Message
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._time import utc_strftime
 from .base import BaseGateway
 
+# 阿里云签名要求的编码方式：除 A-Z a-z 0-9 - _ . ~ 外全部编码 ("/" 也需要编码为 %2F)
+_percent_encode = partial(quote, safe="~")
+
+
 class AliyunGateway(BaseGateway):
     """
     阿里云短信网关
@@ -21,11 +26,16 @@ class AliyunGateway(BaseGateway):
     """
 
     endpoint = "https://dysmsapi.aliyuncs.com"
+    message_id_key = "BizId"
     signature_method = "HMAC-SHA1"
     signature_version = "1.0"
     format = "JSON"
     version = "2017-05-25"
 
+    # SendSms 单次最多1000个号码
+    supports_bulk = True
+    bulk_limit = 1000
+
     def _validate_config(self, config: GatewayConfig) -> None:
         """
         验证配置是否有效
@@ -43,55 +53,85 @@ class AliyunGateway(BaseGateway):
         if not config.sign:
             raise ValueError("缺少必要参数: sign (SignName)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用阿里云SMS服务发送短信
+        构建阿里云SMS服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
+        Returns:
+            请求参数
+        """
+        params = self._get_params(to, message, config)
+        
+        # 添加签名
+        params["Signature"] = self._get_signer(config)(params)
+        
+        return {
+            "method": "GET",
+            "url": self.endpoint,
+            "params": params,
+        }
+
+    def _build_bulk_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建阿里云批量发送请求
+        
+        所有号码使用同一模板参数，SendSms 的 PhoneNumbers 以逗号分隔最多支持1000个号码
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
+            
+        Returns:
+            请求参数
+        """
+        params = self._get_common_params(config)
+        params["PhoneNumbers"] = ",".join([to.get_number() for to in phones])
+        params["TemplateCode"] = message.get_template(self)
+        
+        if message.get_data(self):
+            params["TemplateParam"] = message.get_data_json(self)
+        
+        params["Signature"] = self._get_signer(config)(params)
+        
+        return {
+            "method": "GET",
+            "url": self.endpoint,
+            "params": params,
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析阿里云SMS服务响应
+        
+        Args:
+            response: HTTP响应
+            
         Raises:
             GatewayErrorException: 发送失败时抛出
             
         Returns:
             网关原始响应
         """
-        params = self._get_params(to, message, config)
+        result = self._json_result(response)
         
-        # 添加签名
-        params["Signature"] = self._generate_signature(params, config.app_key)
-        
-        # 构建请求URL
-        try:
-            response = requests.get(
-                self.endpoint,
-                params=params,
-                timeout=config.timeout,
-                verify=config.ssl_verify
+        if result["Code"] != "OK":
+            raise GatewayErrorException(
+                result.get("Message", "Unknown error"),
+                result.get("Code"),
+                data=result
             )
-            response.raise_for_status()  # 抛出异常如果状态码不是200
-            result = response.json()
-            
-            if result["Code"] != "OK":
-                raise GatewayErrorException(
-                    result.get("Message", "Unknown error"),
-                    result.get("Code"),
-                    result
-                )
-            
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
-
-    def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
-        """从阿里云响应中提取消息ID (BizId)"""
-        return response.get("BizId")
+        
+        return result
+
+    def _calculate_fee(self, message: Message) -> int:
+        """模板短信按发送次数计费，无需取出内容计算长度"""
+        return 1
 
     def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
@@ -105,25 +145,14 @@ class AliyunGateway(BaseGateway):
         Returns:
             API请求参数
         """
-        params = {
-            "AccessKeyId": config.app_id,
-            "Action": "SendSms",
-            "Format": self.format,
-            "PhoneNumbers": to.get_number(),
-            "RegionId": config.region or "cn-hangzhou",
-            "SignName": config.sign,
-            "SignatureMethod": self.signature_method,
-            "SignatureNonce": str(uuid.uuid4()),
-            "SignatureVersion": self.signature_version,
-            "TemplateCode": message.get_template(self),
-            "Timestamp": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "Version": config.version or self.version,
-        }
+        params = self._get_common_params(config)
+        params["PhoneNumbers"] = to.get_number()
+        params["TemplateCode"] = message.get_template(self)
         
         # 添加模板参数
         template_param = message.get_data(self)
         if template_param:
-            params["TemplateParam"] = json.dumps(template_param, ensure_ascii=False)
+            params["TemplateParam"] = message.get_data_json(self)
 
         # 国际短信使用国家代码
         country_code = to.get_country_code()
@@ -133,34 +162,111 @@ class AliyunGateway(BaseGateway):
         
         return params
 
-    def _generate_signature(self, params: Dict[str, Any], secret: str) -> str:
+    def _get_common_params(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        获取 SendSms 请求的公共参数
+        
+        与配置有关的参数按配置缓存为模板，每次复制模板后只需填入随机数和时间戳
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            公共参数
+        """
+        params = self._get_config_values(config)["params"].copy()
+        params["SignatureNonce"] = secrets.token_hex(16)
+        params["Timestamp"] = utc_strftime("%Y-%m-%dT%H:%M:%SZ")
+        return params
+
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        只与配置有关的请求参数模板和签名函数
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            公共参数模板 (params) 和签名函数 (signer)
+        """
+        return {
+            "params": dict(
+                self._get_static_params(config),
+                Action="SendSms",
+                SignName=config.sign,
+            ),
+            "signer": self._create_signer(config),
+        }
+
+    def _get_static_params(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        获取只与配置有关、每次请求都相同的公共参数
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            公共参数
+        """
+        return {
+            "AccessKeyId": config.app_id,
+            "Format": self.format,
+            "RegionId": config.region or "cn-hangzhou",
+            "SignatureMethod": self.signature_method,
+            "SignatureVersion": self.signature_version,
+            "Version": config.version or self.version,
+        }
+
+    def _get_signer(self, config: GatewayConfig) -> Callable[[Dict[str, Any]], str]:
         """
-        生成API请求签名
+        获取配置对应的签名函数，与请求参数模板一起按配置缓存
         
         Args:
-            params: API请求参数
-            secret: AccessKey密钥
+            config: 网关配置
             
         Returns:
-            签名
+            签名函数
         """
-        # 排序参数
-        sorted_params = sorted(params.items())
+        return self._get_config_values(config)["signer"]
+
+    def _create_signer(self, config: GatewayConfig) -> Callable[[Dict[str, Any]], str]:
+        """
+        创建签名函数
         
-        # 构建规范化查询字符串
-        canonicalized_query_string = "&".join([
-            f"{requests.utils.quote(k)}={requests.utils.quote(str(v))}"
-            for k, v in sorted_params
-        ])
+        公共参数的编码结果和签名密钥只计算一次，每次签名只需编码随请求变化的参数
         
-        # 构建待签名字符串
-        string_to_sign = "GET&%2F&" + requests.utils.quote(canonicalized_query_string)
+        Args:
+            config: 网关配置
+            
+        Returns:
+            签名函数，参数为完整的API请求参数，返回签名
+        """
+        # 公共参数按键名排好序并编码，签名时只需排序随请求变化的少量参数再合并
+        static_items = sorted(
+            (k, f"{_percent_encode(k)}={_percent_encode(str(v))}")
+            for k, v in self._get_static_params(config).items()
+        )
+        static_keys = frozenset(k for k, _ in static_items)
+        # 预先初始化密钥，每次签名复制后再写入数据，无需重新计算内外填充
+        hmac_template = hmac.new((config.app_key + "&").encode("utf-8"), digestmod=sha1)
         
-        # 计算HMAC-SHA1
-        secret_bytes = (secret + "&").encode("utf-8")
-        string_to_sign_bytes = string_to_sign.encode("utf-8")
-        signature = base64.b64encode(
-            hmac.new(secret_bytes, string_to_sign_bytes, sha1).digest()
-        ).decode("utf-8")
+        def sign(params: Dict[str, Any]) -> str:
+            dynamic_items = sorted(
+                (k, f"{_percent_encode(k)}={_percent_encode(str(v))}")
+                for k, v in params.items() if k not in static_keys
+            )
+            
+            # 合并两个有序列表，构建规范化查询字符串
+            canonicalized_query_string = "&".join([
+                encoded for _, encoded in merge(static_items, dynamic_items)
+            ])
+            
+            # 构建待签名字符串
+            string_to_sign = "GET&%2F&" + _percent_encode(canonicalized_query_string)
+            
+            # 计算HMAC-SHA1
+            h = hmac_template.copy()
+            h.update(string_to_sign.encode("utf-8"))
+            return base64.b64encode(h.digest()).decode("utf-8")
         
-        return signature 
\ No newline at end of file
+        return sign
@@ -1,13 +1,12 @@
-import time
-import hmac
 import hashlib
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List
 
 from ..phone_number import PhoneNumber
 from ..message import Message
+from ..response import SMSResponse
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._time import utc_strftime
 from .base import BaseGateway
 
 class BaiduGateway(BaseGateway):
@@ -18,6 +17,11 @@ class BaiduGateway(BaseGateway):
     """
 
     endpoint = "https://sms.bj.baidubce.com/api/v3/sendSms"
+    message_id_key = "requestId"
+
+    # phoneNumber 单次最多200个号码
+    supports_bulk = True
+    bulk_limit = 200
 
     def _validate_config(self, config: GatewayConfig) -> None:
         """
@@ -36,66 +40,126 @@ class BaiduGateway(BaseGateway):
         if not config.invoke_id:
             raise ValueError("缺少必要参数: invoke_id (调用ID)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用百度云短信服务发送短信
+        构建百度云短信服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
-        Raises:
-            GatewayErrorException: 发送失败时抛出
+        Returns:
+            请求参数
+        """
+        return self._build_http_request([to], message, config)
+
+    def _build_bulk_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建百度云批量发送请求，phoneNumber 为逗号分隔的多个号码
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
             
         Returns:
-            网关原始响应
+            请求参数
+        """
+        return self._build_http_request(phones, message, config)
+
+    def _build_http_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建发送给一个或多个号码的请求
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
+            
+        Returns:
+            请求参数
         """
         # 准备参数
-        params = self._get_params(to, message, config)
+        params = self._get_params(phones, message, config)
         
         # 获取认证头
         headers = self._get_headers(config)
         
-        # 发送请求
-        try:
-            # 使用requests发送请求
-            response = requests.post(
-                self.endpoint,
-                json=params,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+        return {
+            "method": "POST",
+            "url": self.endpoint,
+            "json": params,
+            "headers": headers,
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析百度云短信服务响应
+        
+        Args:
+            response: HTTP响应
             
-            if result.get("code") != "1000":
-                raise GatewayErrorException(
-                    result.get("message", "未知错误"),
-                    result.get("code", "UNKNOWN_ERROR"),
-                    result
-                )
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
+        Returns:
+            网关原始响应
+        """
+        result = self._json_result(response)
+        
+        if result.get("code") != "1000":
+            raise GatewayErrorException(
+                result.get("message", "未知错误"),
+                result.get("code", "UNKNOWN_ERROR"),
+                data=result
+            )
+        
+        return result
+
+    def _calculate_fee(self, message: Message) -> int:
+        """模板短信按发送次数计费，无需取出内容计算长度"""
+        return 1
 
-    def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
-        """从百度云响应中提取请求ID"""
-        return response.get("requestId")
+    def _bulk_responses(self, phones: List[PhoneNumber], message: Message, response: Dict[str, Any]) -> List[SMSResponse]:
+        """
+        根据 data 列表拆分每个号码的发送结果
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            response: 网关原始响应
+            
+        Returns:
+            每个号码对应的响应对象
+        """
+        results = {
+            item.get("mobile"): item
+            for item in response.get("data") or []
+            if isinstance(item, dict)
+        }
+        
+        responses = []
+        for to in phones:
+            item = results.get(to.get_number())
+            if item is None:
+                responses.append(self._missing_status_response(to, response))
+            elif item.get("code", "1000") == "1000":
+                responses.append(self._success_response(to, message, dict(item, requestId=response.get("requestId"))))
+            else:
+                responses.append(self._error_response(to, GatewayErrorException(
+                    item.get("message") or "号码发送失败",
+                    item.get("code"),
+                    data=item
+                )))
+        return responses
 
-    def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _get_params(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
         获取API请求参数
         
         Args:
-            to: 接收人手机号
+            phones: 接收人手机号列表
             message: 短信消息
             config: 网关配置
             
@@ -108,8 +172,8 @@ class BaiduGateway(BaseGateway):
         if not template_id:
             raise GatewayErrorException("缺少模板ID", "TEMPLATE_ERROR")
         
-        # 格式化手机号
-        mobile = to.get_number()
+        # 多个号码以逗号分隔
+        mobile = ",".join([to.get_number() for to in phones])
         
         # 获取模板参数
         template_params = message.get_data(self) or {}
@@ -171,7 +235,7 @@ class BaiduGateway(BaseGateway):
         Returns:
             BCE日期字符串
         """
-        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return utc_strftime("%Y-%m-%dT%H:%M:%SZ")
 
     def _get_authorization(self, headers: Dict[str, str], access_key_id: str, access_key_secret: str) -> str:
         """
@@ -185,18 +249,19 @@ class BaiduGateway(BaseGateway):
         Returns:
             授权字符串
         """
+        # 与请求头使用同一个日期
+        bce_date = headers["x-bce-date"]
+        
         # 创建规范请求
         canonical_uri = "/api/v3/sendSms"
         canonical_query_string = ""
         
         # 创建规范头
-        canonical_headers = ""
-        signed_headers = []
-        
-        for key in sorted(headers.keys()):
-            lower_key = key.lower()
-            signed_headers.append(lower_key)
-            canonical_headers += f"{lower_key}:{headers[key]}\n"
+        keys = sorted(headers)
+        signed_headers = [key.lower() for key in keys]
+        canonical_headers = "".join([
+            f"{lower_key}:{headers[key]}\n" for key, lower_key in zip(keys, signed_headers)
+        ])
         
         # 连接已签名的头
         signed_headers_str = ";".join(signed_headers)
@@ -205,11 +270,9 @@ class BaiduGateway(BaseGateway):
         string_to_sign = f"POST\n{canonical_uri}\n{canonical_query_string}\n{canonical_headers}"
         
         # 生成签名
-        signature = hmac.new(
-            access_key_secret.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        mac = self._new_hmac(access_key_secret, hashlib.sha256)
+        mac.update(string_to_sign.encode('utf-8'))
+        signature = mac.hexdigest()
         
         # 创建授权字符串
-        return f"bce-auth-v1/{access_key_id}/{self._get_bce_date().split('T')[0]}/{signed_headers_str}/{signature}" 
\ No newline at end of file
+        return f"bce-auth-v1/{access_key_id}/{bce_date.split('T')[0]}/{signed_headers_str}/{signature}" 
\ No newline at end of file
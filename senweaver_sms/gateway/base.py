@@ -1,38 +1,418 @@
 """
 网关基类 - 定义所有短信网关的基本接口
 """
-from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+import hmac
+import time
+import random
+import asyncio
+from abc import ABC
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 
+import requests
+
 from ..phone_number import PhoneNumber
 from ..message import Message
 from ..response import SMSResponse
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import loads
+from .._http import fetch_async, get_session, get_async_session
+
+
+# 重试的初始等待时间和最长等待时间（秒）
+RETRY_BACKOFF_BASE = 0.2
+RETRY_BACKOFF_MAX = 2.0
+
+
+def _is_retryable(e: requests.exceptions.RequestException) -> bool:
+    """
+    判断请求异常是否可以安全重试
+    
+    Args:
+        e: 请求异常
+        
+    Returns:
+        连接失败 (含连接超时) 或服务端5xx错误时返回True
+    """
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is not None and e.response.status_code >= 500
+    return isinstance(e, requests.exceptions.ConnectionError)
+
+
+@lru_cache(maxsize=4096)
+def _fee_for_length(length: int) -> int:
+    """
+    根据内容长度计算计费条数
+    
+    普通短信70个字符一条，长短信按67个字符一条拆分
+    
+    Args:
+        length: 内容长度
+        
+    Returns:
+        计费条数
+    """
+    if length <= 70:
+        return 1
+    return (length + 66) // 67  # 67个字符一条，向上取整
 
 
 class BaseGateway(ABC):
     """
     网关基类
     定义所有短信网关必须实现的接口
+
+    子类实现 _build_request 和 _parse_response 后即可同时支持同步和异步发送；
+    也可以直接覆盖 _send 自行处理请求 (此时异步发送会在线程池中执行 _send)
+
+    支持单次请求发送给多个号码的网关设置 supports_bulk/bulk_limit 并实现 _build_bulk_request
     """
     
-    @abstractmethod
+    # 是否支持批量接口，以及单次请求的最大号码数
+    supports_bulk = False
+    bulk_limit = 1
+    
+    # 响应中消息ID所在的字段，None 表示网关不返回消息ID
+    message_id_key: Optional[str] = None
+    
+    # 网关名称，子类未指定时由类名去掉 Gateway 后缀并转为小写得到
+    gateway_name: str = ""
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "gateway_name" not in cls.__dict__:
+            name = cls.__name__
+            cls.gateway_name = (name[:-7] if name.endswith("Gateway") else name).lower()
+    
+    def __init__(self):
+        """
+        初始化
+        """
+        # 请求地址 -> 连接池会话，免去每次发送时解析地址和查找全局会话表
+        self._sessions: Dict[tuple, requests.Session] = {}
+        # (密钥, 摘要算法) -> 已写入密钥的HMAC对象
+        self._hmacs: Dict[tuple, hmac.HMAC] = {}
+    
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建HTTP请求
+        
+        Args:
+            to: 接收人手机号
+            message: 短信消息
+            config: 网关配置
+            
+        Returns:
+            请求参数字典，包含 method、url 以及 params/data/json/headers 等
+        """
+        raise NotImplementedError
+    
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析HTTP响应
+        
+        Args:
+            response: requests.Response 或 AsyncHTTPResponse
+            
+        Raises:
+            GatewayErrorException: 网关返回错误时抛出
+            
+        Returns:
+            网关的原始响应
+        """
+        raise NotImplementedError
+    
     def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
         发送短信的具体实现
-        所有子类必须实现此方法
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
+        Raises:
+            GatewayErrorException: 发送失败时抛出
+            
         Returns:
             网关的原始响应
         """
-        pass
+        return self._request(partial(self._build_request, to, message, config), config)
+    
+    async def _send_async(self, to: PhoneNumber, message: Message, config: GatewayConfig, session=None) -> Dict[str, Any]:
+        """
+        异步发送短信的具体实现
+        
+        Args:
+            to: 接收人手机号
+            message: 短信消息
+            config: 网关配置
+            session: aiohttp.ClientSession，为None时使用当前事件循环的默认会话
+            
+        Raises:
+            GatewayErrorException: 发送失败时抛出
+            
+        Returns:
+            网关的原始响应
+        """
+        # 未实现请求构建的网关（如自定义网关）在线程池中执行同步发送
+        if type(self)._build_request is BaseGateway._build_request:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._send, to, message, config)
+        
+        return await self._request_async(partial(self._build_request, to, message, config), config, session)
+    
+    def _request(self, build_request: Callable[[], Dict[str, Any]], config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建并发送请求，解析响应
+        
+        每次尝试 (包括重试) 都重新构建请求，签名中的随机数和时间戳不会在重试时被重放
+        
+        Args:
+            build_request: 构建请求参数的无参函数，返回值格式同 _build_request
+            config: 网关配置
+            
+        Raises:
+            GatewayErrorException: 发送失败时抛出
+            
+        Returns:
+            网关的原始响应
+        """
+        timeout = config.timeout
+        verify = config.ssl_verify
+        attempt = 0
+        while True:
+            request = build_request()
+            method = request.pop("method")
+            url = request.pop("url")
+            session = self._get_session(url, verify)
+            try:
+                response = session.request(
+                    method,
+                    url,
+                    timeout=timeout,
+                    verify=verify,
+                    **request
+                )
+                return self._parse_response(response)
+            except requests.exceptions.RequestException as e:
+                delay = self._retry_delay(e, attempt, config)
+                if delay is None:
+                    # 其他异常直接抛出，由 send 统一转换为失败响应
+                    raise self._request_error(e) from e
+            time.sleep(delay)
+            attempt += 1
+    
+    def _get_session(self, url: str, ssl_verify: bool) -> requests.Session:
+        """
+        获取请求地址对应的连接池会话
+        
+        会话按主机在所有网关实例间共享，这里只缓存查找结果
+        
+        Args:
+            url: 请求地址
+            ssl_verify: 是否验证SSL证书
+            
+        Returns:
+            requests.Session
+        """
+        key = (url, ssl_verify)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = get_session(url, ssl_verify)
+        return session
+    
+    def close(self) -> None:
+        """
+        释放网关持有的会话引用和缓存的HMAC对象
+        
+        连接池会话在进程内共享，不在这里关闭；需要关闭时调用 _http.close_sessions()
+        """
+        self._sessions.clear()
+        self._hmacs.clear()
+    
+    def _new_hmac(self, key: str, digestmod) -> hmac.HMAC:
+        """
+        创建以 key 为密钥的HMAC对象
+        
+        密钥只编码、填充一次，之后每次复制缓存的对象，省去重复的密钥处理
+        
+        Args:
+            key: 密钥
+            digestmod: 摘要算法，如 hashlib.sha256
+            
+        Returns:
+            尚未写入数据的HMAC对象
+        """
+        cache_key = (key, digestmod)
+        template = self._hmacs.get(cache_key)
+        if template is None:
+            template = self._hmacs[cache_key] = hmac.new(key.encode("utf-8"), digestmod=digestmod)
+        return template.copy()
+    
+    async def _request_async(self, build_request: Callable[[], Dict[str, Any]], config: GatewayConfig, session=None) -> Dict[str, Any]:
+        """
+        异步构建并发送请求，解析响应
+        
+        每次尝试 (包括重试) 都重新构建请求，签名中的随机数和时间戳不会在重试时被重放
+        
+        Args:
+            build_request: 构建请求参数的无参函数，返回值格式同 _build_request
+            config: 网关配置
+            session: aiohttp.ClientSession，为None时使用当前事件循环的默认会话
+            
+        Raises:
+            GatewayErrorException: 发送失败时抛出
+            
+        Returns:
+            网关的原始响应
+        """
+        if session is None:
+            session = await get_async_session()
+        timeout = config.timeout
+        verify = config.ssl_verify
+        attempt = 0
+        while True:
+            try:
+                response = await fetch_async(session, build_request(), timeout, verify)
+                return self._parse_response(response)
+            except requests.exceptions.RequestException as e:
+                delay = self._retry_delay(e, attempt, config)
+                if delay is None:
+                    raise self._request_error(e) from e
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    def _retry_delay(self, e: requests.exceptions.RequestException, attempt: int, config: GatewayConfig) -> Optional[float]:
+        """
+        计算请求失败后重试前的等待时间
+        
+        只重试连接失败和服务端5xx错误；读取超时和4xx错误可能已被网关受理或重试无用，不重试。
+        等待时间按指数退避并加入随机抖动，避免故障时大量客户端同时重试
+        
+        Args:
+            e: 请求异常
+            attempt: 已重试的次数
+            config: 网关配置
+            
+        Returns:
+            等待时间（秒），不应重试时返回None
+        """
+        if attempt >= config.max_retries or not _is_retryable(e):
+            return None
+        return min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+    
+    def _json_result(self, response) -> Dict[str, Any]:
+        """
+        检查HTTP状态码并解析JSON响应体
+        
+        直接解析响应字节 (安装 orjson 时使用 orjson)，不经过 response.json() 的编码检测和文本解码；
+        只在状态码表示失败时才调用 raise_for_status
+        
+        Args:
+            response: requests.Response 或 AsyncHTTPResponse
+            
+        Raises:
+            requests.exceptions.HTTPError: 状态码为4xx/5xx时抛出
+            requests.exceptions.RequestException: 响应体不是有效的JSON时抛出
+            
+        Returns:
+            解析后的响应数据
+        """
+        if response.status_code >= 400:
+            response.raise_for_status()
+        try:
+            return loads(response.content)
+        except ValueError as e:
+            raise requests.exceptions.RequestException(f"响应不是有效的JSON: {e}") from e
+    
+    def _get_endpoint_url(self, config: GatewayConfig) -> str:
+        """
+        获取请求地址，首次解析后按网关类缓存在配置上，配置字段修改后重新解析
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            请求地址
+        """
+        key = (type(self), "endpoint_url")
+        url = config._cache.get(key)
+        if url is None:
+            url = config._cache[key] = self._resolve_endpoint_url(config)
+        return url
+    
+    def _check_config(self, config: GatewayConfig) -> None:
+        """
+        验证配置，通过后按网关类记录在配置上，配置字段修改前不再重复验证
+        
+        Args:
+            config: 网关配置
+            
+        Raises:
+            ValueError: 配置无效时抛出
+        """
+        key = (type(self), "validated")
+        if key not in config._cache:
+            self._validate_config(config)
+            config._cache[key] = True
+    
+    def _get_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        获取由配置推导出的固定参数，首次使用时计算并按网关类缓存在配置上，配置字段修改后重新计算
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            固定参数字典 (调用方不应修改)
+        """
+        key = (type(self), "config_values")
+        values = config._cache.get(key)
+        if values is None:
+            values = config._cache[key] = self._derive_config_values(config)
+        return values
+    
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        根据配置计算每次请求都相同的参数，默认没有，需要的网关覆盖此方法
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            固定参数字典
+        """
+        return {}
+    
+    def _resolve_endpoint_url(self, config: GatewayConfig) -> Optional[str]:
+        """
+        根据配置解析请求地址
+        默认使用类属性 endpoint，地址需要拼接或另有命名的网关覆盖此方法
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            请求地址，无法确定时返回None
+        """
+        return getattr(self, "endpoint", None)
+    
+    def _request_error(self, e: requests.exceptions.RequestException) -> GatewayErrorException:
+        """
+        将请求异常转换为网关异常
+        子类可以覆盖此方法细分错误代码
+        
+        Args:
+            e: 请求异常
+            
+        Returns:
+            网关异常
+        """
+        return GatewayErrorException.wrap(e, "REQUEST_ERROR")
     
     def send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> SMSResponse:
         """
@@ -47,50 +427,224 @@ class BaseGateway(ABC):
         Returns:
             统一的SMS响应对象
         """
-        # 获取网关名称
-        gateway_name = self._get_gateway_name()
-        
         try:
             # 验证必要的配置
-            self._validate_config(config)
+            self._check_config(config)
             
             # 调用具体的发送实现
             response = self._send(to, message, config)
             
-            # 提取消息ID
-            message_id = self._extract_message_id(response)
+            # 创建成功响应
+            return self._success_response(to, message, response)
+        except GatewayErrorException as e:
+            return self._error_response(to, e)
+        except Exception as e:
+            return self._failed_response(to, e)
+    
+    async def send_async(self, to: PhoneNumber, message: Message, config: GatewayConfig, session=None) -> SMSResponse:
+        """
+        异步发送短信
+        
+        Args:
+            to: 接收人手机号
+            message: 短信消息
+            config: 网关配置
+            session: 共享的 aiohttp.ClientSession，不传时使用当前事件循环的默认会话
             
-            # 计算计费条数
-            fee = self._calculate_fee(message)
+        Returns:
+            统一的SMS响应对象
+        """
+        try:
+            self._check_config(config)
+            response = await self._send_async(to, message, config, session)
+            return self._success_response(to, message, response)
+        except GatewayErrorException as e:
+            return self._error_response(to, e)
+        except Exception as e:
+            return self._failed_response(to, e)
+    
+    def _build_bulk_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建批量发送请求 (同一条消息发送给多个号码)
+        
+        Args:
+            phones: 接收人手机号列表，长度不超过 bulk_limit
+            message: 短信消息
+            config: 网关配置
             
-            # 创建成功响应
-            return SMSResponse.success(
-                gateway=gateway_name,
-                phone_number=to.get_number(),
-                message_id=message_id,
-                send_time=datetime.now(),
-                fee=fee,
-                raw_response=response
-            )
+        Returns:
+            请求参数字典，格式同 _build_request
+        """
+        raise NotImplementedError
+    
+    def send_bulk(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> List[SMSResponse]:
+        """
+        通过网关批量接口发送短信
+        
+        Args:
+            phones: 接收人手机号列表，长度不超过 bulk_limit
+            message: 短信消息
+            config: 网关配置
+            
+        Returns:
+            每个号码对应的响应对象，顺序与 phones 一致
+        """
+        try:
+            self._check_config(config)
+            response = self._request(partial(self._build_bulk_request, phones, message, config), config)
+            return self._bulk_responses(phones, message, response)
+        except GatewayErrorException as e:
+            return [self._error_response(to, e) for to in phones]
+        except Exception as e:
+            return [self._failed_response(to, e) for to in phones]
+    
+    async def send_bulk_async(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig, session=None) -> List[SMSResponse]:
+        """
+        通过网关批量接口异步发送短信
+        
+        Args:
+            phones: 接收人手机号列表，长度不超过 bulk_limit
+            message: 短信消息
+            config: 网关配置
+            session: 共享的 aiohttp.ClientSession，不传时使用当前事件循环的默认会话
+            
+        Returns:
+            每个号码对应的响应对象，顺序与 phones 一致
+        """
+        try:
+            self._check_config(config)
+            response = await self._request_async(partial(self._build_bulk_request, phones, message, config), config, session)
+            return self._bulk_responses(phones, message, response)
         except GatewayErrorException as e:
-            # 处理网关错误
-            return SMSResponse.failed(
-                gateway=gateway_name,
-                phone_number=to.get_number(),
-                error_code=str(e.code),
-                error_message=str(e),
-                error_details=e.data,
-                raw_response=e.data
-            )
+            return [self._error_response(to, e) for to in phones]
         except Exception as e:
-            # 处理其他异常
-            return SMSResponse.failed(
-                gateway=gateway_name,
-                phone_number=to.get_number(),
-                error_code="UNKNOWN_ERROR",
-                error_message=str(e),
-                raw_response={"error": str(e)}
-            )
+            return [self._failed_response(to, e) for to in phones]
+    
+    def send_batch(self, recipients: List[PhoneNumber], message: Message, config: GatewayConfig, max_workers: int = 32) -> List[SMSResponse]:
+        """
+        发送同一条短信给多个号码
+        
+        支持批量接口的网关按 bulk_limit 分片调用 send_bulk，其他网关在线程池中并发逐个发送，
+        所有请求共用连接池会话
+        
+        Args:
+            recipients: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
+            max_workers: 最大并发请求数
+            
+        Returns:
+            每个号码对应的响应对象，顺序与 recipients 一致
+        """
+        if self.supports_bulk:
+            limit = self.bulk_limit
+            items = [recipients[i:i + limit] for i in range(0, len(recipients), limit)]
+            send = lambda chunk: self.send_bulk(chunk, message, config)
+        else:
+            items = recipients
+            send = lambda to: [self.send(to, message, config)]
+        
+        if len(items) <= 1:
+            return [response for item in items for response in send(item)]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return [response for responses in executor.map(send, items) for response in responses]
+    
+    def _bulk_responses(self, phones: List[PhoneNumber], message: Message, response: Dict[str, Any]) -> List[SMSResponse]:
+        """
+        将批量接口的响应拆分为每个号码的响应
+        默认所有号码共用同一个结果，返回逐号状态的网关可以覆盖此方法
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            response: 网关原始响应
+            
+        Returns:
+            每个号码对应的响应对象
+        """
+        return [self._success_response(to, message, response) for to in phones]
+    
+    def _success_response(self, to: PhoneNumber, message: Message, response: Dict[str, Any]) -> SMSResponse:
+        """
+        创建成功响应
+        
+        Args:
+            to: 接收人手机号
+            message: 短信消息
+            response: 网关原始响应
+            
+        Returns:
+            成功响应对象
+        """
+        return SMSResponse.success(
+            gateway=self.gateway_name,
+            phone_number=to.get_number(),
+            message_id=self._extract_message_id(response),
+            send_time=datetime.now(),
+            fee=self._calculate_fee(message),
+            raw_response=response
+        )
+    
+    def _failed_response(self, to: PhoneNumber, e: Exception) -> SMSResponse:
+        """
+        根据异常创建失败响应
+        
+        Args:
+            to: 接收人手机号
+            e: 发送过程中的异常
+            
+        Returns:
+            失败响应对象
+        """
+        if isinstance(e, GatewayErrorException):
+            return self._error_response(to, e)
+        # 处理其他异常
+        return SMSResponse.failed(
+            gateway=self.gateway_name,
+            phone_number=to.get_number(),
+            error_code="UNKNOWN_ERROR",
+            error_message=str(e),
+            raw_response={"error": str(e)}
+        )
+    
+    def _error_response(self, to: PhoneNumber, e: GatewayErrorException) -> SMSResponse:
+        """
+        根据网关异常创建失败响应
+        
+        Args:
+            to: 接收人手机号
+            e: 网关异常
+            
+        Returns:
+            失败响应对象
+        """
+        return SMSResponse.failed(
+            gateway=self.gateway_name,
+            phone_number=to.get_number(),
+            error_code=str(e.code),
+            error_message=str(e),
+            error_details=e.data,
+            raw_response=e.data
+        )
+    
+    def _missing_status_response(self, to: PhoneNumber, response: Dict[str, Any]) -> SMSResponse:
+        """
+        创建网关未返回逐号结果时的失败响应
+        无法确认是否送达的号码按失败处理，以便交给备用网关重试
+        
+        Args:
+            to: 接收人手机号
+            response: 网关原始响应
+            
+        Returns:
+            失败响应对象
+        """
+        return self._error_response(to, GatewayErrorException(
+            "网关未返回该号码的发送结果",
+            "MISSING_STATUS",
+            data=response
+        ))
     
     def _validate_config(self, config: GatewayConfig) -> None:
         """
@@ -105,19 +659,6 @@ class BaseGateway(ABC):
         """
         pass
     
-    def _get_gateway_name(self) -> str:
-        """
-        获取网关名称
-        
-        Returns:
-            网关名称
-        """
-        class_name = self.__class__.__name__
-        # 移除Gateway后缀，并转为小写
-        if class_name.endswith("Gateway"):
-            return class_name[:-7].lower()
-        return class_name.lower()
-    
     def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
         """
         从响应中提取消息ID
@@ -128,11 +669,12 @@ class BaseGateway(ABC):
         Returns:
             消息ID，如果不存在返回None
         """
-        # 尝试从不同网关的响应中提取消息ID
-        for key in ["message_id", "msg_id", "msgid", "smsid", "sid", "id"]:
-            if key in response:
-                return str(response[key])
-        return None
+        # 消息ID位于固定字段的网关只需设置 message_id_key，结构嵌套的网关覆盖此方法
+        if self.message_id_key is None:
+            return None
+        # 部分网关返回数字类型的ID，统一转为字符串
+        message_id = response.get(self.message_id_key)
+        return None if message_id is None else str(message_id)
     
     def _calculate_fee(self, message: Message) -> int:
         """
@@ -144,15 +686,8 @@ class BaseGateway(ABC):
         Returns:
             计费条数
         """
-        # 默认计算逻辑，子类可以覆盖
+        # 默认按内容长度计算，按模板计费的网关可以覆盖
         content = message.get_content()
         if not content:
             return 1
-            
-        # 根据内容长度计算条数
-        # 普通短信：70个字符一条
-        # 长短信：67个字符一条
-        length = len(content)
-        if length <= 70:
-            return 1
-        return (length + 66) // 67  # 67个字符一条，向上取整 
\ No newline at end of file
+        return _fee_for_length(len(content))
@@ -1,14 +1,13 @@
-import json
 import time
-import hmac
 import hashlib
-import requests
 from typing import Dict, Any, Optional
 
 from ..phone_number import PhoneNumber
 from ..message import Message
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import dumpb
+from .._time import utc_strftime
 from .base import BaseGateway
 
 class CtyunGateway(BaseGateway):
@@ -37,56 +36,56 @@ class CtyunGateway(BaseGateway):
         if not config.sign:
             raise ValueError("缺少必要参数: sign (短信签名)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用天翼云短信服务发送短信
+        构建天翼云短信服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
-        Raises:
-            GatewayErrorException: 发送失败时抛出
-            
         Returns:
-            网关原始响应
+            请求参数
         """
         # 准备参数
         params = self._get_params(to, message, config)
-        request_body = json.dumps(params).encode('utf-8')
+        # 只序列化一次，签名和发送使用同一份请求体
+        request_body = dumpb(params)
         
         # 生成头信息
         headers = self._get_headers(request_body, config)
         
-        # 发送请求
-        try:
-            # 使用requests发送请求
-            response = requests.post(
-                self.endpoint,
-                json=params,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+        return {
+            "method": "POST",
+            "url": self.endpoint,
+            "data": request_body,
+            "headers": headers,
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析天翼云短信服务响应
+        
+        Args:
+            response: HTTP响应
             
-            if result.get("statusCode") != "200":
-                raise GatewayErrorException(
-                    result.get("reason", "未知错误"),
-                    result.get("statusCode", "UNKNOWN_ERROR"),
-                    result
-                )
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
+        Returns:
+            网关原始响应
+        """
+        result = self._json_result(response)
+        
+        if result.get("statusCode") != "200":
+            raise GatewayErrorException(
+                result.get("reason", "未知错误"),
+                result.get("statusCode", "UNKNOWN_ERROR"),
+                data=result
+            )
+        
+        return result
 
     def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
         """从天翼云响应中提取请求ID"""
@@ -95,6 +94,10 @@ class CtyunGateway(BaseGateway):
             return response["result"].get("requestId")
         return response.get("requestId") # 直接尝试顶层
 
+    def _calculate_fee(self, message: Message) -> int:
+        """模板短信按发送次数计费，无需取出内容计算长度"""
+        return 1
+
     def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
         获取API请求参数
@@ -123,7 +126,7 @@ class CtyunGateway(BaseGateway):
             "sign": config.sign,
             "templateCode": template_id,
             "phoneNumbers": phone_number,
-            "templateParam": json.dumps(template_params) if template_params else "{}"
+            "templateParam": message.get_data_json(self) if template_params else "{}"
         }
 
     def _get_headers(self, body: bytes, config: GatewayConfig) -> Dict[str, str]:
@@ -142,19 +145,19 @@ class CtyunGateway(BaseGateway):
         secret_key = config.app_key
         
         # 获取时间戳
-        now = int(time.time() * 1000)
-        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S.%fZ", time.gmtime(now / 1000))
+        # time.strftime 不支持 %f，秒以上部分按秒缓存，再拼接微秒
+        now = time.time()
+        second = int(now)
+        timestamp = f"{utc_strftime('%Y-%m-%dT%H:%M:%S', second)}.{int((now - second) * 1000000):06d}Z"
         
         # 计算内容SHA256
         content_sha256 = hashlib.sha256(body).hexdigest()
         
         # 生成签名
         string_to_sign = f"ctyun;{access_key};{timestamp};{content_sha256}"
-        signature = hmac.new(
-            secret_key.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        mac = self._new_hmac(secret_key, hashlib.sha256)
+        mac.update(string_to_sign.encode('utf-8'))
+        signature = mac.hexdigest()
         
         # 创建授权头
         auth_header = f"ctyun {access_key}:{timestamp}:{signature}"
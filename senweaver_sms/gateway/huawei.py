@@ -1,18 +1,34 @@
 """华为云短信网关实现"""
-import json
+import os
 import time
-import random
 import hashlib
-import requests
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, List
 
 from ..phone_number import PhoneNumber
 from ..message import Message
+from ..response import SMSResponse
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import dumpb
 from .base import BaseGateway
 
 
+@lru_cache(maxsize=32)
+def _secret_digest(app_secret: str):
+    """已写入密钥的SHA-256对象
+
+    签名内容以密钥开头，每次签名复制该对象后再写入随机数和时间戳，密钥只编码、写入一次
+
+    Args:
+        app_secret: 应用密钥
+
+    Returns:
+        hashlib SHA-256 对象 (调用方应先 copy 再使用)
+    """
+    return hashlib.sha256(app_secret.encode('utf-8'))
+
+
 class HuaweiGateway(BaseGateway):
     """华为云短信网关
     
@@ -29,6 +45,16 @@ class HuaweiGateway(BaseGateway):
     default_endpoint = "https://smsapi.cn-north-4.myhuaweicloud.com"
     api_path = "/sms/batchSendSms/v1"
 
+    # batchSendSms 的 to 字段单次最多1000个号码
+    supports_bulk = True
+    bulk_limit = 1000
+
+    # 表示成功的 code / status
+    success_code = "000000"
+
+    # 每个请求都相同的请求头
+    base_headers = {"Content-Type": "application/json"}
+
     def _validate_config(self, config: GatewayConfig) -> None:
         """
         验证配置是否有效
@@ -46,70 +72,117 @@ class HuaweiGateway(BaseGateway):
         if not config.channel:
             raise ValueError("缺少必要参数: channel (短信通道号)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
-        """使用华为云短信服务发送短信
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """构建华为云短信服务请求
 
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
 
-        Raises:
-            GatewayErrorException: 发送失败时抛出
+        Returns:
+            请求参数
+        """
+        return self._build_http_request([to], message, config)
+
+    def _build_bulk_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """构建华为云批量发送请求
+
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
 
         Returns:
-            网关原始响应
+            请求参数
+        """
+        return self._build_http_request(phones, message, config)
+
+    def _build_http_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """构建发送给一个或多个号码的请求
+
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
+
+        Returns:
+            请求参数
         """
         # 构建请求体
         body = {
-            "from": config.channel,
-            "to": [to.get_number()],
+            **self._get_config_values(config),
+            "to": [to.get_number() for to in phones],
             "templateId": message.get_template(self),
-            "signature": config.sign or config.channel,  # 默认使用channel作为签名
-            "statusCallback": config.callback_url or "",
         }
 
         # 添加模板参数
         template_param = message.get_data(self)
         if template_param:
-            body["templateParas"] = json.dumps(template_param, ensure_ascii=False)
+            body["templateParas"] = message.get_data_json(self)
 
-        try:
-            # 准备请求
-            endpoint_url = config.endpoint or self.default_endpoint
-            url = f"{endpoint_url}{self.api_path}"
-            headers = {
-                "Content-Type": "application/json",
-                **self._get_auth_headers(config.app_id, config.app_key)
-            }
-            
-            # 使用requests发送请求
-            response = requests.post(
-                url,
-                json=body,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get("code") != "000000":
-                raise GatewayErrorException(
-                    result.get("description", "未知错误"),
-                    result.get("code", "UNKNOWN_ERROR"),
-                    result
-                )
-            
-            return result
+        # 准备请求
+        url = self._get_endpoint_url(config)
+        headers = {
+            **self.base_headers,
+            **self._get_auth_headers(config.app_id, config.app_key)
+        }
+        
+        return {
+            "method": "POST",
+            "url": url,
+            "data": dumpb(body),
+            "headers": headers,
+        }
 
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """请求体中只与配置有关的字段
+
+        Args:
+            config: 网关配置
+
+        Returns:
+            请求体的固定字段
+        """
+        return {
+            "from": config.channel,
+            "signature": config.sign or config.channel,  # 默认使用channel作为签名
+            "statusCallback": config.callback_url or "",
+        }
+
+    def _resolve_endpoint_url(self, config: GatewayConfig) -> str:
+        """解析发送接口地址
+
+        Args:
+            config: 网关配置
+
+        Returns:
+            请求地址
+        """
+        return f"{config.endpoint or self.default_endpoint}{self.api_path}"
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """解析华为云短信服务响应
+
+        Args:
+            response: HTTP响应
+
+        Raises:
+            GatewayErrorException: 发送失败时抛出
+
+        Returns:
+            网关原始响应
+        """
+        result = self._json_result(response)
+        
+        if result.get("code") != self.success_code:
+            raise GatewayErrorException(
+                result.get("description", "未知错误"),
+                result.get("code", "UNKNOWN_ERROR"),
+                data=result
+            )
+        
+        return result
 
     def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
         """从华为云响应中提取消息ID (smsMsgId)"""
@@ -120,9 +193,44 @@ class HuaweiGateway(BaseGateway):
                 return first_result.get("smsMsgId")
         return None
 
+    def _bulk_responses(self, phones: List[PhoneNumber], message: Message, response: Dict[str, Any]) -> List[SMSResponse]:
+        """根据 result 列表拆分每个号码的发送结果
+
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            response: 网关原始响应
+
+        Returns:
+            每个号码对应的响应对象
+        """
+        results = {
+            item.get("originTo"): item
+            for item in response.get("result") or []
+            if isinstance(item, dict)
+        }
+
+        responses = []
+        for to in phones:
+            item = results.get(to.get_number())
+            if item is None:
+                responses.append(self._missing_status_response(to, response))
+            elif item.get("status", self.success_code) == self.success_code:
+                responses.append(self._success_response(to, message, {"result": [item]}))
+            else:
+                responses.append(self._error_response(to, GatewayErrorException(
+                    "号码发送失败",
+                    item.get("status"),
+                    data=item
+                )))
+        return responses
+
     def _get_auth_headers(self, app_key: str, app_secret: str) -> Dict[str, str]:
         """生成认证头信息
 
+        每个请求使用新的随机数和时间戳重新签名，服务端据此防重放；
+        只有写入密钥后的摘要对象在进程内按密钥缓存
+
         Args:
             app_key: 应用密钥
             app_secret: 应用密钥
@@ -130,18 +238,19 @@ class HuaweiGateway(BaseGateway):
         Returns:
             认证头信息
         """
-        timestamp = str(int(time.time() * 1000))
-        nonce = str(random.randint(100000, 999999))
+        # 毫秒时间戳，整数运算避免浮点转换
+        timestamp = str(time.time_ns() // 1_000_000)
+        nonce = os.urandom(8).hex()
         
-        # 生成签名
-        sign_str = f"{app_secret}{nonce}{timestamp}"
-        signature = hashlib.sha256(sign_str.encode('utf-8')).hexdigest()
+        # 签名: SHA-256(密钥 + 随机数 + 时间戳)
+        digest = _secret_digest(app_secret).copy()
+        digest.update(f"{nonce}{timestamp}".encode('utf-8'))
         
         return {
             "X-App-Key": app_key,
             "X-Nonce": nonce,
             "X-Timestamp": timestamp,
-            "X-Signature": signature,
+            "X-Signature": digest.hexdigest(),
         }
 
     def query_status(self, task_id: str, config: GatewayConfig) -> Dict[str, Any]:
@@ -157,38 +266,24 @@ class HuaweiGateway(BaseGateway):
         Returns:
             查询结果
         """
-        try:
-            endpoint_url = config.endpoint or self.default_endpoint
-            url = f"{endpoint_url}/sms/getSmsTaskDetail/v1"
-            headers = {
-                "Content-Type": "application/json",
-                **self._get_auth_headers(config.app_id, config.app_key)
+        endpoint_url = config.endpoint or self.default_endpoint
+        
+        def build_request() -> Dict[str, Any]:
+            # 每次尝试重新签名
+            return {
+                "method": "POST",
+                "url": f"{endpoint_url}/sms/getSmsTaskDetail/v1",
+                "json": {"taskId": task_id},
+                "headers": {
+                    **self.base_headers,
+                    **self._get_auth_headers(config.app_id, config.app_key)
+                },
             }
-            
-            # 使用requests发送请求
-            response = requests.post(
-                url,
-                json={"taskId": task_id},
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get("code") != "000000":
-                raise GatewayErrorException(
-                    result.get("description", "未知错误"),
-                    result.get("code", "UNKNOWN_ERROR"),
-                    result
-                )
-            
-            return result
-
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
+        
+        # 与发送共用连接池会话，响应格式与发送接口一致
+        try:
+            return self._request(build_request, config)
+        except GatewayErrorException:
+            raise
         except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e) 
\ No newline at end of file
+            raise GatewayErrorException.wrap(e, "UNKNOWN_ERROR") from e 
\ No newline at end of file
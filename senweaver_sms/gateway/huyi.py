@@ -1,5 +1,5 @@
-import requests
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any
 
 from ..phone_number import PhoneNumber
 from ..message import Message
@@ -15,6 +15,10 @@ class HuyiGateway(BaseGateway):
     """
 
     endpoint = "http://106.ihuyi.com/webservice/sms.php?method=Submit"
+    message_id_key = "smsid"
+
+    # 一次扫描取出响应中的 code / msg / smsid
+    _XML_RE = re.compile(rb"<(code|msg|smsid)>([^<]*)</\1>")
 
     def _validate_config(self, config: GatewayConfig) -> None:
         """
@@ -31,68 +35,62 @@ class HuyiGateway(BaseGateway):
         if not config.app_key:
             raise ValueError("缺少必要参数: app_key (互亿无线密码)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用互亿无线SMS服务发送短信
+        构建互亿无线SMS服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
-        Raises:
-            GatewayErrorException: 发送失败时抛出
-            
         Returns:
-            网关原始响应
+            请求参数
         """
         # 准备参数
         params = self._get_params(to, message, config)
         
-        # 发送请求
-        try:
-            # 设置头信息
-            headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        return {
+            "method": "POST",
+            "url": self.endpoint,
+            "data": params,
+            "headers": {'Content-Type': 'application/x-www-form-urlencoded'},
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析互亿无线SMS服务响应
+        
+        Args:
+            response: HTTP响应
             
-            # 发送请求
-            response = requests.post(
-                self.endpoint,
-                data=params,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
+        Returns:
+            网关原始响应
+        """
+        if response.status_code >= 400:
             response.raise_for_status()
-            response_text = response.text
-            
-            # 响应是XML格式，手动解析
-            if "<code>2</code>" not in response_text:
-                # 在XML中查找错误代码和消息
-                code = self._parse_xml(response_text, "code")
-                msg = self._parse_xml(response_text, "msg")
-                raise GatewayErrorException(
-                    msg or "未知错误",
-                    code or "UNKNOWN_ERROR",
-                    {"response": response_text}
-                )
-            
-            return {
-                "code": 2,
-                "msg": "发送成功",
-                "smsid": self._parse_xml(response_text, "smsid")
-            }
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
-
-    def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
-        """从互亿无线响应中提取消息ID (smsid)"""
-        # 成功时 _send 方法已经解析并返回了 smsid
-        return response.get("smsid")
+        content = response.content
+        
+        # 响应是XML格式，直接在字节上匹配，成功时无需解码整个响应
+        fields = {
+            tag.decode(): value.decode("utf-8", errors="replace")
+            for tag, value in self._XML_RE.findall(content)
+        }
+        if b"<code>2</code>" not in content:
+            raise GatewayErrorException(
+                fields.get("msg") or "未知错误",
+                fields.get("code") or "UNKNOWN_ERROR",
+                data={"response": response.text}
+            )
+        
+        return {
+            "code": 2,
+            "msg": "发送成功",
+            "smsid": fields.get("smsid", "")
+        }
 
     def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, str]:
         """
@@ -115,28 +113,22 @@ class HuyiGateway(BaseGateway):
         phone_number = to.get_number()
         
         return {
-            "account": config.app_id,
-            "password": config.app_key,
+            **self._get_config_values(config),
             "mobile": phone_number,
             "content": content,
         }
 
-    def _parse_xml(self, xml_string: str, tag: str) -> str:
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, str]:
         """
-        简单的XML解析器，用于从标签中提取值
+        账号参数，只与配置有关
         
         Args:
-            xml_string: 要解析的XML字符串
-            tag: 要提取值的标签
+            config: 网关配置
             
         Returns:
-            标签内的值，如果未找到则返回空字符串
+            账号和密码参数
         """
-        start_tag = f"<{tag}>"
-        end_tag = f"</{tag}>"
-        start_index = xml_string.find(start_tag)
-        end_index = xml_string.find(end_tag)
-        
-        if start_index != -1 and end_index != -1:
-            return xml_string[start_index + len(start_tag) : end_index]
-        return "" 
\ No newline at end of file
+        return {
+            "account": config.app_id,
+            "password": config.app_key,
+        }
@@ -1,5 +1,5 @@
-import requests
 from typing import Dict, Any, Optional
+from urllib.parse import quote_plus
 
 from ..phone_number import PhoneNumber
 from ..message import Message
@@ -29,51 +29,50 @@ class JuheGateway(BaseGateway):
         if not config.app_key:
             raise ValueError("缺少必要参数: app_key (聚合数据AppKey)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用聚合数据短信服务发送短信
+        构建聚合数据短信服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
+        Returns:
+            请求参数
+        """
+        # 准备参数
+        params = self._get_params(to, message, config)
+        
+        return {
+            "method": "GET",
+            "url": self.endpoint,
+            "params": params,
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析聚合数据短信服务响应
+        
+        Args:
+            response: HTTP响应
+            
         Raises:
             GatewayErrorException: 发送失败时抛出
             
         Returns:
             网关原始响应
         """
-        # 准备参数
-        params = self._get_params(to, message, config)
+        result = self._json_result(response)
         
-        # 发送请求
-        try:
-            # 使用requests发送请求
-            response = requests.get(
-                self.endpoint,
-                params=params,
-                timeout=config.timeout,
-                verify=config.ssl_verify
+        if result.get("error_code") != 0:
+            raise GatewayErrorException(
+                result.get("reason", "未知错误"),
+                result.get("error_code", "UNKNOWN_ERROR"),
+                data=result
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get("error_code") != 0:
-                raise GatewayErrorException(
-                    result.get("reason", "未知错误"),
-                    result.get("error_code", "UNKNOWN_ERROR"),
-                    result
-                )
-            
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
+        
+        return result
 
     def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
         """从聚合数据响应中提取消息ID (sid)"""
@@ -105,20 +104,19 @@ class JuheGateway(BaseGateway):
         # 获取模板参数
         template_params = message.get_data(self) or {}
         
-        # 格式化参数
+        # 格式化参数 (#key#=value&#key2#=value2，# 编码为 %23)
         tpl_value = ""
         if template_params:
             if isinstance(template_params, dict):
-                # 将字典转换为聚合格式 (#key#=value&#key2#=value2)
-                tpl_value = requests.utils.urlencode(
-                    {f"#{k}#": v for k, v in template_params.items()}
-                )
+                items = template_params.items()
             elif isinstance(template_params, list):
                 # 假设列表对应 #code#, #code2# 等
-                tpl_dict = {}
-                for i, v in enumerate(template_params):
-                    tpl_dict[f"#code{i+1 if i > 0 else ''}#"] = v
-                tpl_value = requests.utils.urlencode(tpl_dict)
+                items = ((f"code{i + 1 if i > 0 else ''}", v) for i, v in enumerate(template_params))
+            else:
+                items = ()
+            tpl_value = "&".join([
+                f"%23{quote_plus(str(k))}%23={quote_plus(str(v))}" for k, v in items
+            ])
         
         return {
             "mobile": phone_number,
@@ -1,5 +1,4 @@
 """移动mas短信网关实现"""
-import json
 import base64
 import hashlib
 import requests
@@ -9,6 +8,7 @@ from ..phone_number import PhoneNumber
 from ..message import Message
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import dumps, dumpb, loads
 from .base import BaseGateway
 
 
@@ -28,6 +28,22 @@ class MasGateway(BaseGateway):
     default_endpoint = "http://112.35.1.155:1992/sms/norsubmit"
     template_endpoint = "http://112.35.1.155:1992/sms/tmpsubmit"
 
+    # 依次写入MAC签名的字段 (ecName + apId + secretKey 之后的部分)
+    normal_mac_fields = ("mobiles", "content", "sign", "addSerial")
+    template_mac_fields = ("templateId", "mobiles", "params", "sign", "addSerial")
+
+    # 请求头固定不变，所有请求共用
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "senweaver-sms/1.0"
+    }
+
+    def __init__(self):
+        """初始化"""
+        super().__init__()
+        # 按配置缓存的MAC签名前缀
+        self._mac_prefixes: Dict[tuple, Any] = {}
+
     def _validate_config(self, config: GatewayConfig) -> None:
         """验证配置是否有效
         
@@ -47,29 +63,26 @@ class MasGateway(BaseGateway):
         if not config.app_secret:
             raise ValueError("MAS网关缺少必需的配置参数: ec_name (app_secret)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
-        """使用移动mas短信服务发送短信
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """构建移动mas短信服务请求
 
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
 
-        Raises:
-            GatewayErrorException: 发送失败时抛出
-
         Returns:
-            网关原始响应
+            请求参数
         """
         # 判断是否为模板短信
         template_id = message.get_template(self)
         if template_id:
-            return self._send_template_sms(to, message, config)
+            return self._build_template_request(to, message, config)
         else:
-            return self._send_normal_sms(to, message, config)
+            return self._build_normal_request(to, message, config)
 
-    def _send_normal_sms(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
-        """发送普通短信
+    def _build_normal_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """构建普通短信请求
         
         Args:
             to: 接收人手机号
@@ -77,7 +90,7 @@ class MasGateway(BaseGateway):
             config: 网关配置
             
         Returns:
-            网关原始响应
+            请求参数
         """
         # 构建请求参数
         add_serial = getattr(config, 'add_serial', '') or ''  # 扩展码，默认为空
@@ -91,22 +104,16 @@ class MasGateway(BaseGateway):
             "addSerial": add_serial       # 扩展码
         }
         
-        # 生成MAC签名
-        mac_string = (
-            request_data["ecName"] +
-            request_data["apId"] +
-            config.app_key +
-            request_data["mobiles"] +
-            request_data["content"] +
-            request_data["sign"] +
-            request_data["addSerial"]
-        )
-        request_data["mac"] = hashlib.md5(mac_string.encode('utf-8')).hexdigest().lower()
+        # 生成MAC签名 (ecName + apId + secretKey 部分已预先计算)
+        mac = self._new_mac(config)
+        for field in self.normal_mac_fields:
+            mac.update(request_data[field].encode('utf-8'))
+        request_data["mac"] = mac.hexdigest()
         
-        return self._make_request(request_data, config, is_template=False)
+        return self._build_http_request(request_data, config, is_template=False)
 
-    def _send_template_sms(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
-        """发送模板短信
+    def _build_template_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """构建模板短信请求
         
         Args:
             to: 接收人手机号
@@ -114,7 +121,7 @@ class MasGateway(BaseGateway):
             config: 网关配置
             
         Returns:
-            网关原始响应
+            请求参数
         """
         # 构建请求参数
         add_serial = getattr(config, 'add_serial', '') or ''  # 扩展码，默认为空
@@ -125,28 +132,40 @@ class MasGateway(BaseGateway):
             "apId": config.app_id,           # 用户名/账号
             "templateId": message.get_template(self),  # 模板ID
             "mobiles": to.get_number(),      # 手机号码
-            "params": json.dumps(template_params, ensure_ascii=False),  # 模板参数
+            "params": dumps(template_params),  # 模板参数
             "sign": config.sign,             # 签名编码
             "addSerial": add_serial          # 扩展码
         }
         
-        # 生成MAC签名 (模板短信的签名顺序)
-        mac_string = (
-            request_data["ecName"] +
-            request_data["apId"] +
-            config.app_key +
-            request_data["templateId"] +
-            request_data["mobiles"] +
-            request_data["params"] +
-            request_data["sign"] +
-            request_data["addSerial"]
-        )
-        request_data["mac"] = hashlib.md5(mac_string.encode('utf-8')).hexdigest().lower()
+        # 生成MAC签名 (模板短信的签名顺序，ecName + apId + secretKey 部分已预先计算)
+        mac = self._new_mac(config)
+        for field in self.template_mac_fields:
+            mac.update(request_data[field].encode('utf-8'))
+        request_data["mac"] = mac.hexdigest()
+        
+        return self._build_http_request(request_data, config, is_template=True)
+
+    def _new_mac(self, config: GatewayConfig):
+        """创建已写入 ecName + apId + secretKey 的MD5对象
         
-        return self._make_request(request_data, config, is_template=True)
+        这三项只与配置有关，按配置缓存计算结果，每次签名复制后再写入其余字段
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            hashlib.md5 对象
+        """
+        key = (config.app_secret, config.app_id, config.app_key)
+        prefix = self._mac_prefixes.get(key)
+        if prefix is None:
+            prefix = self._mac_prefixes[key] = hashlib.md5(
+                (config.app_secret + config.app_id + config.app_key).encode('utf-8')
+            )
+        return prefix.copy()
 
-    def _make_request(self, request_data: Dict[str, Any], config: GatewayConfig, is_template: bool = False) -> Dict[str, Any]:
-        """发送HTTP请求
+    def _build_http_request(self, request_data: Dict[str, Any], config: GatewayConfig, is_template: bool = False) -> Dict[str, Any]:
+        """构建HTTP请求
         
         Args:
             request_data: 请求数据
@@ -154,64 +173,85 @@ class MasGateway(BaseGateway):
             is_template: 是否为模板短信
             
         Returns:
-            网关原始响应
+            请求参数
         """
-        try:
-            # 选择端点
-            if is_template:
-                url = config.endpoint or self.template_endpoint
-            else:
-                url = config.endpoint or self.default_endpoint
+        # 选择端点
+        if is_template:
+            url = config.endpoint or self.template_endpoint
+        else:
+            url = config.endpoint or self.default_endpoint
+        
+        # 将请求数据序列化为JSON字节串并进行Base64编码
+        encoded_data = base64.b64encode(dumpb(request_data))
+        
+        return {
+            "method": "POST",
+            "url": url,
+            "data": encoded_data,
+            "headers": self.headers,
+        }
+
+    def _resolve_endpoint_url(self, config: GatewayConfig) -> str:
+        """解析请求地址 (普通短信接口，与模板短信接口位于同一主机)
+        
+        Args:
+            config: 网关配置
             
-            # 将请求数据转换为JSON并进行Base64编码
-            json_data = json.dumps(request_data, ensure_ascii=False)
-            encoded_data = base64.b64encode(json_data.encode('utf-8')).decode('utf-8')
+        Returns:
+            请求地址
+        """
+        return config.endpoint or self.default_endpoint
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """解析HTTP响应
+        
+        Args:
+            response: HTTP响应
             
-            # 设置请求头
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "senweaver-sms/1.0"
-            }
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
-            # 发送请求
-            response = requests.post(
-                url,
-                data=encoded_data,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
+        Returns:
+            网关原始响应
+        """
+        # 检查HTTP状态码
+        if response.status_code != 200:
+            raise GatewayErrorException(
+                f"HTTP请求失败: {response.status_code}",
+                response.status_code
             )
+        
+        # 解析响应
+        try:
+            result = loads(response.content)
+        except ValueError:
+            raise GatewayErrorException(
+                f"响应格式错误: {response.text}",
+                "INVALID_RESPONSE"
+            )
+        
+        # 检查业务状态码
+        if result.get("rspcod") != "success":
+            error_code = result.get("rspcod", "UNKNOWN_ERROR")
+            error_msg = f"短信发送失败: {error_code}"
+            raise GatewayErrorException(error_msg, error_code)
+        
+        return result
+
+    def _request_error(self, e: requests.exceptions.RequestException) -> GatewayErrorException:
+        """将请求异常转换为网关异常
+        
+        Args:
+            e: 请求异常
             
-            # 检查HTTP状态码
-            if response.status_code != 200:
-                raise GatewayErrorException(
-                    f"HTTP请求失败: {response.status_code}",
-                    response.status_code
-                )
-            
-            # 解析响应
-            try:
-                result = response.json()
-            except json.JSONDecodeError:
-                raise GatewayErrorException(
-                    f"响应格式错误: {response.text}",
-                    "INVALID_RESPONSE"
-                )
-            
-            # 检查业务状态码
-            if result.get("rspcod") != "success":
-                error_code = result.get("rspcod", "UNKNOWN_ERROR")
-                error_msg = f"短信发送失败: {error_code}"
-                raise GatewayErrorException(error_msg, error_code)
-            
-            return result
-            
-        except requests.exceptions.Timeout:
-            raise GatewayErrorException("请求超时", "TIMEOUT")
-        except requests.exceptions.ConnectionError:
-            raise GatewayErrorException("连接错误", "CONNECTION_ERROR")
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(f"请求异常: {str(e)}", "REQUEST_ERROR")
+        Returns:
+            网关异常
+        """
+        if isinstance(e, requests.exceptions.Timeout):
+            return GatewayErrorException("请求超时", "TIMEOUT")
+        if isinstance(e, requests.exceptions.ConnectionError):
+            return GatewayErrorException("连接错误", "CONNECTION_ERROR")
+        return GatewayErrorException(f"请求异常: {str(e)}", "REQUEST_ERROR")
 
     def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
         """从响应中提取消息ID
@@ -223,12 +263,4 @@ class MasGateway(BaseGateway):
             消息ID，如果没有则返回None
         """
         # 移动mas返回的消息批次号
-        return response.get("msgGroup")
-
-    def _get_gateway_name(self) -> str:
-        """获取网关名称
-        
-        Returns:
-            网关名称
-        """
-        return "mas"
\ No newline at end of file
+        return response.get("msgGroup")
\ No newline at end of file
@@ -1,16 +1,53 @@
-import json
 import hashlib
 import hmac
 import time
-import requests
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, List
 
 from ..phone_number import PhoneNumber
 from ..message import Message
+from ..response import SMSResponse
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import dumpb
+from .._time import utc_date
 from .base import BaseGateway
 
+
+def _hmac_sha256(key: bytes, msg: str) -> bytes:
+    """
+    计算HMAC-SHA256
+    
+    Args:
+        key: 密钥
+        msg: 消息
+        
+    Returns:
+        HMAC-SHA256结果
+    """
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=8)
+def _derive_signing_key(secret_key: str, date: str, service: str) -> bytes:
+    """
+    派生 TC3-HMAC-SHA256 的签名密钥
+    
+    密钥只与 SecretKey、UTC 日期和服务名有关，同一天内的请求可以复用
+    
+    Args:
+        secret_key: SecretKey
+        date: UTC 日期 (YYYY-MM-DD)
+        service: 服务名
+        
+    Returns:
+        签名密钥
+    """
+    secret_date = _hmac_sha256(f"TC3{secret_key}".encode("utf-8"), date)
+    secret_service = _hmac_sha256(secret_date, service)
+    return _hmac_sha256(secret_service, "tc3_request")
+
+
 class QcloudGateway(BaseGateway):
     """
     腾讯云网关 (Tencent Cloud SMS)
@@ -23,6 +60,21 @@ class QcloudGateway(BaseGateway):
     service = "sms"
     version = "2021-01-11"
 
+    # 参与签名的请求头固定不变
+    canonical_headers = f"content-type:application/json; charset=utf-8\nhost:{host}\n"
+    signed_headers = "content-type;host"
+
+    # 每个请求都相同的请求头
+    base_headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Host": host,
+        "X-TC-Action": "SendSms",
+    }
+
+    # SendSms 的 PhoneNumberSet 单次最多200个号码
+    supports_bulk = True
+    bulk_limit = 200
+
     def _validate_config(self, config: GatewayConfig) -> None:
         """
         验证配置是否有效
@@ -42,66 +94,123 @@ class QcloudGateway(BaseGateway):
         if not config.sign:
             raise ValueError("缺少必要参数: sign (短信签名)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用腾讯云短信服务发送短信
+        构建腾讯云短信服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
-        Raises:
-            GatewayErrorException: 发送失败时抛出
+        Returns:
+            请求参数
+        """
+        return self._build_http_request(self._get_params([to], message, config), config)
+
+    def _build_bulk_request(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        构建腾讯云批量发送请求 (PhoneNumberSet 中包含多个号码)
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            config: 网关配置
             
         Returns:
-            网关原始响应
+            请求参数
+        """
+        return self._build_http_request(self._get_params(phones, message, config), config)
+
+    def _build_http_request(self, params: Dict[str, Any], config: GatewayConfig) -> Dict[str, Any]:
         """
-        # 准备参数
-        params = self._get_params(to, message, config)
+        为API请求参数添加认证信息
         
-        # 获取认证参数
-        auth_params = self._get_auth_params(params, config)
+        Args:
+            params: API请求参数
+            config: 网关配置
+            
+        Returns:
+            请求参数
+        """
+        # 请求体只序列化一次，签名与发送使用同一份字节
+        payload = dumpb(params)
+        
+        # 签名与 X-TC-Timestamp 使用同一个时间戳
+        timestamp = int(time.time())
         
         # 请求头
         headers = {
-            "Content-Type": "application/json; charset=utf-8",
-            "Host": self.host,
-            "X-TC-Action": "SendSms",
-            "X-TC-Timestamp": str(int(time.time())),
-            "X-TC-Version": config.version or self.version,
-            "X-TC-Region": config.region or "",
-            "Authorization": auth_params["authorization"],
+            **self._get_config_values(config)["headers"],
+            "X-TC-Timestamp": str(timestamp),
+            "Authorization": self._get_authorization(payload, timestamp, config),
         }
         
-        # 发送请求
-        try:
-            response = requests.post(
-                self.url,
-                json=params,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
+        return {
+            "method": "POST",
+            "url": self.url,
+            "data": payload,
+            "headers": headers,
+        }
+
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        只与配置有关的请求参数和请求头
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            固定的请求参数 (params) 和请求头 (headers)
+        """
+        return {
+            "params": {
+                "SmsSdkAppId": str(config.app_id),
+                "SignName": config.sign,
+            },
+            "headers": {
+                **self.base_headers,
+                "X-TC-Version": config.version or self.version,
+                "X-TC-Region": config.region or "",
+            },
+        }
+
+    def _resolve_endpoint_url(self, config: GatewayConfig) -> str:
+        """
+        解析请求地址
+        
+        Args:
+            config: 网关配置
             
-            response.raise_for_status()
-            result = response.json()
+        Returns:
+            请求地址
+        """
+        return self.url
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析腾讯云短信服务响应
+        
+        Args:
+            response: HTTP响应
             
-            if "Error" in result.get("Response", {}):
-                error = result["Response"]["Error"]
-                raise GatewayErrorException(
-                    error.get("Message", "未知错误"),
-                    error.get("Code", "UNKNOWN_ERROR"),
-                    result
-                )
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
-            return result["Response"]
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
+        Returns:
+            网关原始响应
+        """
+        result = self._json_result(response)
+        
+        if "Error" in result.get("Response", {}):
+            error = result["Response"]["Error"]
+            raise GatewayErrorException(
+                error.get("Message", "未知错误"),
+                error.get("Code", "UNKNOWN_ERROR"),
+                data=result
+            )
+        
+        return result["Response"]
 
     def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
         """从腾讯云响应中提取消息ID (SerialNo)"""
@@ -112,12 +221,57 @@ class QcloudGateway(BaseGateway):
                 return first_status.get("SerialNo")
         return None
 
-    def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _bulk_responses(self, phones: List[PhoneNumber], message: Message, response: Dict[str, Any]) -> List[SMSResponse]:
         """
-        获取API请求参数
+        根据 SendStatusSet 拆分每个号码的发送结果
+        
+        Args:
+            phones: 接收人手机号列表
+            message: 短信消息
+            response: 网关原始响应
+            
+        Returns:
+            每个号码对应的响应对象
+        """
+        statuses = {
+            status.get("PhoneNumber"): status
+            for status in response.get("SendStatusSet") or []
+            if isinstance(status, dict)
+        }
+        
+        responses = []
+        for to in phones:
+            status = statuses.get(self._format_phone(to))
+            if status is None:
+                responses.append(self._missing_status_response(to, response))
+            elif status.get("Code") == "Ok":
+                responses.append(self._success_response(to, message, {"SendStatusSet": [status]}))
+            else:
+                responses.append(self._error_response(to, GatewayErrorException(
+                    status.get("Message", "未知错误"),
+                    status.get("Code", "UNKNOWN_ERROR"),
+                    data=status
+                )))
+        return responses
+
+    def _format_phone(self, to: PhoneNumber) -> str:
+        """
+        格式化为 E.164 格式的手机号
         
         Args:
             to: 接收人手机号
+            
+        Returns:
+            格式化后的手机号
+        """
+        return f"+{to.get_country_code() or '86'}{to.get_number()}"
+
+    def _get_params(self, phones: List[PhoneNumber], message: Message, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        获取API请求参数
+        
+        Args:
+            phones: 接收人手机号列表
             message: 短信消息
             config: 网关配置
             
@@ -128,9 +282,6 @@ class QcloudGateway(BaseGateway):
         if not template_id:
             raise GatewayErrorException("缺少模板ID", "TEMPLATE_ERROR")
         
-        # 格式化手机号
-        phone_number = f"+{to.get_country_code() or '86'}{to.get_number()}"
-        
         # 获取模板参数
         template_param_set = []
         template_params = message.get_data(self)
@@ -141,38 +292,37 @@ class QcloudGateway(BaseGateway):
             template_param_set = list(template_params.values())
         
         return {
-            "PhoneNumberSet": [phone_number],
-            "SmsSdkAppId": str(config.app_id),
-            "SignName": config.sign,
+            "PhoneNumberSet": [self._format_phone(to) for to in phones],
+            **self._get_config_values(config)["params"],
             "TemplateId": str(template_id),
             "TemplateParamSet": [str(param) for param in template_param_set],
         }
 
-    def _get_auth_params(self, params: Dict[str, Any], config: GatewayConfig) -> Dict[str, Any]:
+    def _get_authorization(self, payload: bytes, timestamp: int, config: GatewayConfig) -> str:
         """
-        生成API请求的认证参数
+        生成API请求的授权信息
         
         Args:
-            params: API请求参数
+            payload: 请求体
+            timestamp: 请求时间戳（秒）
             config: 网关配置
             
         Returns:
-            认证参数
+            Authorization 请求头的值
         """
         secret_id = config.app_key
         secret_key = config.app_secret
         
-        # 获取时间戳和日期
-        timestamp = int(time.time())
-        date = time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+        # 获取日期 (按天缓存)
+        date = utc_date(timestamp)
         
         # 生成规范请求字符串
         http_request_method = "POST"
         canonical_uri = "/"
         canonical_query_string = ""
-        canonical_headers = f"content-type:application/json; charset=utf-8\nhost:{self.host}\n"
-        signed_headers = "content-type;host"
-        hashed_request_payload = hashlib.sha256(json.dumps(params).encode("utf-8")).hexdigest()
+        canonical_headers = self.canonical_headers
+        signed_headers = self.signed_headers
+        hashed_request_payload = hashlib.sha256(payload).hexdigest()
         canonical_request = f"{http_request_method}\n{canonical_uri}\n{canonical_query_string}\n{canonical_headers}\n{signed_headers}\n{hashed_request_payload}"
         
         # 生成待签名字符串
@@ -182,34 +332,13 @@ class QcloudGateway(BaseGateway):
         string_to_sign = f"{algorithm}\n{timestamp}\n{credential_scope}\n{hashed_canonical_request}"
         
         # 计算签名
-        secret_date = self._hmac_sha256(f"TC3{secret_key}".encode("utf-8"), date)
-        secret_service = self._hmac_sha256(secret_date, self.service)
-        secret_signing = self._hmac_sha256(secret_service, "tc3_request")
+        secret_signing = _derive_signing_key(secret_key, date, self.service)
         signature = hmac.new(secret_signing, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
         
         # 生成授权信息
-        authorization = (
+        return (
             f"{algorithm} "
             f"Credential={secret_id}/{credential_scope}, "
             f"SignedHeaders={signed_headers}, "
             f"Signature={signature}"
         )
-        
-        return {
-            "authorization": authorization,
-            "timestamp": timestamp,
-            "date": date,
-        }
-
-    def _hmac_sha256(self, key: bytes, msg: str) -> bytes:
-        """
-        计算HMAC-SHA256
-        
-        Args:
-            key: 密钥
-            msg: 消息
-            
-        Returns:
-            HMAC-SHA256结果
-        """
-        return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest() 
\ No newline at end of file
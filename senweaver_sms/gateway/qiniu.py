@@ -1,16 +1,35 @@
-import json
 import hmac
-import hashlib
 import base64
-import requests
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any
+from urllib.parse import urlsplit
 
 from ..phone_number import PhoneNumber
 from ..message import Message
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import dumpb
 from .base import BaseGateway
 
+
+@lru_cache(maxsize=8)
+def _sign_prefix(url: str) -> bytes:
+    """
+    生成待签名内容中请求体之前的部分，只与请求地址有关
+    
+    Args:
+        url: 请求URL
+        
+    Returns:
+        UTF-8 编码的签名前缀
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return f"POST {path}\nHost: {parts.netloc}\nContent-Type: application/json\n\n".encode('utf-8')
+
+
 class QiniuGateway(BaseGateway):
     """
     七牛云短信网关
@@ -19,6 +38,7 @@ class QiniuGateway(BaseGateway):
     """
 
     endpoint = "https://sms.qiniuapi.com/v1/message"
+    message_id_key = "job_id"
 
     def _validate_config(self, config: GatewayConfig) -> None:
         """
@@ -35,24 +55,21 @@ class QiniuGateway(BaseGateway):
         if not config.app_key:
             raise ValueError("缺少必要参数: app_key (七牛SecretKey)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用七牛云短信服务发送短信
+        构建七牛云短信服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
-        Raises:
-            GatewayErrorException: 发送失败时抛出
-            
         Returns:
-            网关原始响应
+            请求参数
         """
         # 获取请求体
         body = self._get_request_body(to, message, config)
-        request_body = json.dumps(body).encode('utf-8')
+        request_body = dumpb(body)
         
         # 生成授权头
         headers = {
@@ -60,37 +77,33 @@ class QiniuGateway(BaseGateway):
             "Authorization": self._generate_auth_token(config.app_id, config.app_key, self.endpoint, request_body)
         }
         
-        # 发送请求
-        try:
-            response = requests.post(
-                self.endpoint,
-                json=body,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+        return {
+            "method": "POST",
+            "url": self.endpoint,
+            "data": request_body,
+            "headers": headers,
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析七牛云短信服务响应
+        
+        Args:
+            response: HTTP响应
             
-            if "error" in result:
-                raise GatewayErrorException(
-                    result.get("message", "未知错误"),
-                    result.get("error", "UNKNOWN_ERROR"),
-                    result
-                )
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
-
-    def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
-        """从七牛云响应中提取消息ID (job_id)"""
-        return response.get("job_id")
+        Returns:
+            网关原始响应
+        """
+        result = self._json_result(response)
+        
+        error = result.get("error")
+        if error is not None:
+            raise GatewayErrorException(result.get("message", "未知错误"), error, data=result)
+        
+        return result
 
     def _get_request_body(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
@@ -134,25 +147,13 @@ class QiniuGateway(BaseGateway):
         Returns:
             授权令牌
         """
-        # 解析URL
-        parsed_url = requests.utils.urlparse(url)
-        
-        # 创建待签名字符串
-        path = parsed_url.path
-        if parsed_url.query:
-            path = f"{path}?{parsed_url.query}"
-        
-        data_to_sign = f"POST {path}\nHost: {parsed_url.netloc}\nContent-Type: application/json\n\n"
-        
-        if body:
-            data_to_sign += body.decode('utf-8')
+        # 待签名内容: 按地址缓存的固定前缀 + 请求体
+        data_to_sign = _sign_prefix(url) + (body or b"")
         
-        # 生成签名
-        signature = hmac.new(
-            secret_key.encode('utf-8'),
-            data_to_sign.encode('utf-8'),
-            hashlib.sha1
-        ).digest()
+        # 生成签名 (一次性计算，不创建 HMAC 对象)
+        # hmac/hashlib 由 OpenSSL 实现，CPU 支持时自动使用 SHA 硬件指令；每条短信只签几百字节，
+        # 耗时远小于一次 HTTPS 往返，不要为此引入自定义的哈希实现
+        signature = hmac.digest(secret_key.encode('utf-8'), data_to_sign, 'sha1')
         
         encoded_signature = base64.urlsafe_b64encode(signature).decode('utf-8')
         
@@ -2,7 +2,6 @@
 短信宝网关 - 通过短信宝服务发送短信
 """
 import hashlib
-import requests
 from typing import Dict, Any
 
 from ..phone_number import PhoneNumber
@@ -51,55 +50,58 @@ class SmsBaoGateway(BaseGateway):
         if not config.app_key:
             raise ValueError("短信宝密码不能为空，请设置app_key")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        发送短信
+        构建短信宝请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
+        Returns:
+            请求参数
+        """
+        # 准备参数
+        params = self._get_params(to, message, config)
+        
+        return {
+            "method": "GET",
+            "url": self.endpoint,
+            "params": params,
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析短信宝响应
+        
+        Args:
+            response: HTTP响应
+            
         Returns:
             网关响应
             
         Raises:
             GatewayErrorException: 发送失败时抛出
         """
-        # 准备参数
-        params = self._get_params(to, message, config)
+        if response.status_code >= 400:
+            response.raise_for_status()
+        raw = response.content
         
-        # 发送请求
-        try:
-            response = requests.get(
-                self.endpoint,
-                params=params,
-                timeout=config.timeout
+        # 短信宝只返回一个状态码，成功时直接比较字节，失败时才解码和查找错误信息
+        if raw.strip() != b"0":
+            status_code = raw.decode("ascii", errors="replace").strip()
+            error_message = self.STATUS_CODES.get(status_code, "未知错误")
+            raise GatewayErrorException(
+                error_message,
+                status_code,
+                data={"status": status_code, "message": error_message}
             )
-            
-            response.raise_for_status()
-            status_code = response.text.strip()
-            
-            # 短信宝只返回一个状态码
-            if status_code != "0":
-                error_message = self.STATUS_CODES.get(status_code, "未知错误")
-                raise GatewayErrorException(
-                    error_message,
-                    status_code,
-                    {"status": status_code, "message": error_message}
-                )
-            
-            return {
-                "status": "0",
-                "message": "发送成功",
-                "mobile": to.get_number()
-            }
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
+        
+        return {
+            "status": "0",
+            "message": "发送成功"
+        }
 
     def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, str]:
         """
@@ -118,22 +120,37 @@ class SmsBaoGateway(BaseGateway):
         if not content:
             raise GatewayErrorException("短信内容不能为空", "CONTENT_ERROR")
         
+        values = self._get_config_values(config)
+        
         # 添加签名
-        if config.sign and not content.startswith(f"【{config.sign}】"):
-            content = f"【{config.sign}】{content}"
+        sign_prefix = values["sign_prefix"]
+        if sign_prefix and not content.startswith(sign_prefix):
+            content = sign_prefix + content
         
         # 获取手机号
         phone_number = to.get_number()
         
-        # 密码MD5加密 
-        # 短信宝使用app_id作为用户名，app_key作为密码
-        username = config.app_id
-        password = config.app_key
-        hashed_password = hashlib.md5(password.encode()).hexdigest()
-        
         return {
-            "u": username,
-            "p": hashed_password,
+            **values["credentials"],
             "m": phone_number,
             "c": content,
-        } 
\ No newline at end of file
+        }
+
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        只与配置有关的参数，密码的MD5只计算一次
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            账号参数 (credentials) 和签名前缀 (sign_prefix)
+        """
+        # 短信宝使用app_id作为用户名，app_key作为密码 (MD5加密)
+        return {
+            "credentials": {
+                "u": config.app_id,
+                "p": hashlib.md5(config.app_key.encode()).hexdigest(),
+            },
+            "sign_prefix": f"【{config.sign}】" if config.sign else "",
+        }
@@ -1,12 +1,11 @@
-import json
-import requests
 import hashlib
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 
 from ..phone_number import PhoneNumber
 from ..message import Message
 from ..exception.exception import GatewayErrorException
 from ..config import GatewayConfig
+from .._json import dumps
 from .base import BaseGateway
 
 class UcloudGateway(BaseGateway):
@@ -17,6 +16,10 @@ class UcloudGateway(BaseGateway):
     """
 
     endpoint = "https://api.ucloud.cn"
+    message_id_key = "SessionNo"
+
+    # 签名时的参数顺序 (_get_params 可能生成的全部参数，已按名称排序)
+    _SIGN_KEY_ORDER = ("Action", "PhoneNumbers", "ProjectId", "PublicKey", "SigContent", "TemplateId", "TemplateParams")
 
     def _validate_config(self, config: GatewayConfig) -> None:
         """
@@ -35,60 +38,49 @@ class UcloudGateway(BaseGateway):
         if not config.sign:
             raise ValueError("缺少必要参数: sign (短信签名)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用UCloud短信服务发送短信
+        构建UCloud短信服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
-        Raises:
-            GatewayErrorException: 发送失败时抛出
-            
         Returns:
-            网关原始响应
+            请求参数
         """
         # 准备参数
         params = self._get_params(to, message, config)
         params = self._sign_params(params, config)
         
-        # 发送请求
-        try:
-            # 设置头信息
-            headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-            
-            # 发送请求
-            response = requests.post(
-                self.endpoint,
-                data=params,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+        return {
+            "method": "POST",
+            "url": self.endpoint,
+            "data": params,
+            "headers": {'Content-Type': 'application/x-www-form-urlencoded'},
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析UCloud短信服务响应
+        
+        Args:
+            response: HTTP响应
             
-            if result.get("RetCode") != 0:
-                raise GatewayErrorException(
-                    result.get("Message", "未知错误"),
-                    result.get("RetCode", "UNKNOWN_ERROR"),
-                    result
-                )
+        Raises:
+            GatewayErrorException: 发送失败时抛出
             
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
-
-    def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
-        """从UCloud响应中提取消息ID (SessionNo)"""
-        return response.get("SessionNo")
+        Returns:
+            网关原始响应
+        """
+        result = self._json_result(response)
+        
+        ret_code = result.get("RetCode", "UNKNOWN_ERROR")
+        if ret_code != 0:
+            raise GatewayErrorException(result.get("Message", "未知错误"), ret_code, data=result)
+        
+        return result
 
     def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, str]:
         """
@@ -132,7 +124,7 @@ class UcloudGateway(BaseGateway):
                 template_params = list(template_params.values())
             
             # 转换为JSON字符串
-            params["TemplateParams"] = json.dumps(template_params)
+            params["TemplateParams"] = dumps(template_params)
         
         return params
 
@@ -150,16 +142,15 @@ class UcloudGateway(BaseGateway):
         # 获取私钥
         private_key = config.app_key
         
-        # 排序参数
-        sorted_params = sorted(params.items())
-        
-        # 构建查询字符串
-        query_string = "&".join([f"{k}={v}" for k, v in sorted_params])
+        # 按预先排好的顺序构建查询字符串，不必每次排序
+        query_string = "&".join([f"{k}={params[k]}" for k in self._SIGN_KEY_ORDER if k in params])
         
         # 添加私钥
         string_to_sign = query_string + private_key
         
         # 生成签名
+        # hashlib 由 OpenSSL 实现，CPU 支持时自动使用 SHA 硬件指令；签名内容很短，
+        # 耗时远小于一次 HTTPS 往返，不要为此引入自定义的哈希实现
         signature = hashlib.sha1(string_to_sign.encode('utf-8')).hexdigest()
         
         # 将签名添加到参数中
@@ -1,5 +1,4 @@
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 
 from ..phone_number import PhoneNumber
 from ..message import Message
@@ -15,6 +14,7 @@ class YunpianGateway(BaseGateway):
     """
 
     endpoint = "https://sms.yunpian.com/v2/sms/single_send.json"
+    message_id_key = "sid"
 
     def _validate_config(self, config: GatewayConfig) -> None:
         """
@@ -29,55 +29,47 @@ class YunpianGateway(BaseGateway):
         if not config.app_key:
             raise ValueError("缺少必要参数: app_key (API Key)")
 
-    def _send(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
+    def _build_request(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
-        使用云片SMS服务发送短信
+        构建云片SMS服务请求
         
         Args:
             to: 接收人手机号
             message: 短信消息
             config: 网关配置
             
+        Returns:
+            请求参数
+        """
+        params = self._get_params(to, message, config)
+        
+        return {
+            "method": "POST",
+            "url": self.endpoint,
+            "data": params,
+            "headers": {'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'},
+        }
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        解析云片SMS服务响应
+        
+        Args:
+            response: HTTP响应
+            
         Raises:
             GatewayErrorException: 发送失败时抛出
             
         Returns:
             网关原始响应
         """
-        params = self._get_params(to, message, config)
+        result = self._json_result(response)
         
-        # 发送请求
-        try:
-            headers = {'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'}
-            response = requests.post(
-                self.endpoint,
-                data=params,
-                headers=headers,
-                timeout=config.timeout,
-                verify=config.ssl_verify
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get("code") != 0:
-                raise GatewayErrorException(
-                    result.get("msg", "Unknown error"),
-                    result.get("code"),
-                    result
-                )
-            
-            return result
-        except requests.exceptions.RequestException as e:
-            raise GatewayErrorException(str(e), "REQUEST_ERROR", e)
-        except Exception as e:
-            if isinstance(e, GatewayErrorException):
-                raise e
-            raise GatewayErrorException(str(e), "UNKNOWN_ERROR", e)
-
-    def _extract_message_id(self, response: Dict[str, Any]) -> Optional[str]:
-        """从云片响应中提取消息ID (sid)"""
-        return response.get("sid")
+        code = result.get("code")
+        if code != 0:
+            raise GatewayErrorException(result.get("msg", "Unknown error"), code, data=result)
+        
+        return result
 
     def _get_params(self, to: PhoneNumber, message: Message, config: GatewayConfig) -> Dict[str, Any]:
         """
@@ -96,21 +88,32 @@ class YunpianGateway(BaseGateway):
         if not content:
             raise GatewayErrorException("云片网关缺少短信内容")
         
-        # 检查内容是否有签名
-        signature = config.sign or config.extras.get("signature", "")
-        if signature and not content.startswith(f"【{signature}】"):
-            # 如果没有签名，添加签名
-            content = f"【{signature}】{content}"
+        # 检查内容是否有签名，没有时添加
+        sign_prefix = self._get_config_values(config)["sign_prefix"]
+        if sign_prefix and not content.startswith(sign_prefix):
+            content = sign_prefix + content
         
         # 构建手机号
         mobile = to.get_number()
         country_code = to.get_country_code()
         if country_code and country_code != "86":
             # 国际短信
-            mobile = f"+{country_code}{mobile}"
+            mobile = to.get_international_format()
         
         return {
             "apikey": config.app_key,
             "mobile": mobile,
             "text": content,
-        } 
\ No newline at end of file
+        }
+
+    def _derive_config_values(self, config: GatewayConfig) -> Dict[str, Any]:
+        """
+        只与配置有关的参数
+        
+        Args:
+            config: 网关配置
+            
+        Returns:
+            签名前缀 (sign_prefix)
+        """
+        return {"sign_prefix": f"【{config.sign}】" if config.sign else ""} 
\ No newline at end of file
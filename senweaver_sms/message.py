@@ -1,5 +1,32 @@
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from .contract.message import BaseMessage
+from ._json import dumps
+
+# Values that can be compared safely against a shallow snapshot
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Marks an attribute that was never set, as opposed to one set to None
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _dumps_str_items(items: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Serialize string-only template data given as an items tuple.
+
+    Shared by all messages, so separate messages carrying the same template
+    data (e.g. one message per recipient in a campaign) reuse one JSON string.
+    Only str values are accepted: 1, 1.0 and True hash alike but serialize
+    differently.
+
+    Args:
+        items: The template data items, in order
+
+    Returns:
+        str: The JSON encoded template data
+    """
+    return dumps(dict(items))
 
 class Message(BaseMessage):
     """
@@ -30,12 +57,8 @@ class Message(BaseMessage):
         Returns:
             str: The message content
         """
-        if hasattr(self, 'content'):
-            if callable(self.content):
-                return self.content(gateway)
-            return self.content
-        
-        return ''
+        content = getattr(self, 'content', '')
+        return content(gateway) if callable(content) else content
 
     def get_template(self, gateway=None) -> str:
         """
@@ -47,12 +70,8 @@ class Message(BaseMessage):
         Returns:
             str: The message template ID
         """
-        if hasattr(self, 'template'):
-            if callable(self.template):
-                return self.template(gateway)
-            return self.template
-        
-        return ''
+        template = getattr(self, 'template', '')
+        return template(gateway) if callable(template) else template
 
     def get_data(self, gateway=None) -> Dict[str, Any]:
         """
@@ -64,12 +83,41 @@ class Message(BaseMessage):
         Returns:
             Dict[str, Any]: The message template data
         """
-        if hasattr(self, 'data'):
-            if callable(self.data):
-                return self.data(gateway)
-            return self.data
-        
-        return {}
+        data = getattr(self, 'data', _MISSING)
+        if data is _MISSING:
+            return {}
+        return data(gateway) if callable(data) else data
+
+    def get_data_json(self, gateway=None) -> str:
+        """
+        Get the message template data serialized as JSON.
+
+        The result is cached while the data stays equal, so a message reused
+        for many recipients is only serialized once. Data whose values are all
+        strings is also cached across messages. Callable data and data with
+        nested values are serialized on every call.
+
+        Args:
+            gateway: The gateway instance. Defaults to None.
+
+        Returns:
+            str: The JSON encoded template data
+        """
+        data = self.get_data(gateway)
+        if callable(getattr(self, 'data', None)) or not isinstance(data, dict):
+            return dumps(data)
+
+        cached = getattr(self, '_data_json', None)
+        if cached is not None and cached[0] == data:
+            return cached[1]
+
+        if all(type(value) is str for value in data.values()):
+            data_json = _dumps_str_items(tuple(data.items()))
+        else:
+            data_json = dumps(data)
+        if all(isinstance(value, _SCALAR_TYPES) for value in data.values()):
+            self._data_json = (dict(data), data_json)
+        return data_json
 
     def get_strategy(self) -> Optional[str]:
         """
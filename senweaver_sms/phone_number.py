@@ -1,6 +1,9 @@
 class PhoneNumber:
     """Class for handling international phone numbers"""
 
+    # Batch sends create one instance per recipient, so avoid a per-instance dict
+    __slots__ = ("number", "country_code", "_international")
+
     def __init__(self, number, country_code=None):
         """
         Initialize a new PhoneNumber.
@@ -11,6 +14,7 @@ class PhoneNumber:
         """
         self.number = str(number)
         self.country_code = str(country_code) if country_code is not None else None
+        self._international = None
 
     def get_number(self):
         """
@@ -34,13 +38,19 @@ class PhoneNumber:
         """
         Get the international format of the phone number.
 
+        The result is computed on first use and cached.
+
         Returns:
             str: The international format of the phone number
         """
-        if self.country_code is None:
-            return self.number
-        
-        return f"+{self.country_code}{self.number}"
+        international = self._international
+        if international is None:
+            if self.country_code is None:
+                international = self.number
+            else:
+                international = f"+{self.country_code}{self.number}"
+            self._international = international
+        return international
 
     def __str__(self):
         """
@@ -1,18 +1,104 @@
 """
 短信请求类 - 统一的短信发送入口
 """
-from typing import Dict, Any, List, Union, Optional
+import importlib
+import importlib.util
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, Any, List, Union, Optional, Sequence, Type
 
 from .config import SMSConfig, GatewayConfig
 from .message import Message
 from .phone_number import PhoneNumber
+from . import gateway as gateway_package
+from .gateway import _GATEWAY_CLASS_NAMES
 from .gateway.base import BaseGateway
 from .strategy.base import BaseStrategy
 from .strategy.order import OrderStrategy
 from .response import SMSResponse, SMSBatchResponse
+from ._http import prewarm_sessions, close_sessions
+from .breaker import CircuitBreaker
 from .exception.exception import NoGatewayAvailableException, NoGatewaySelectedException, InvalidArgumentException
 
 
+def _import_optional(package: str, name: str):
+    """
+    导入按名称查找的网关或策略模块
+    
+    先用 find_spec 确认模块存在，不靠捕获 ImportError 判断；
+    模块内部的导入错误 (如缺少依赖) 照常抛出，不会被误报为未找到
+    
+    Args:
+        package: 所在包的完整名称
+        name: 模块名称
+        
+    Returns:
+        模块对象，模块不存在时返回None
+    """
+    # 名称中带点时会被当作子包路径查找，不可能是有效的网关或策略
+    if "." in name:
+        return None
+    module_name = f"{package}.{name}"
+    if importlib.util.find_spec(module_name) is None:
+        return None
+    return importlib.import_module(module_name)
+
+
+@lru_cache(maxsize=None)
+def _find_gateway_class(name: str) -> Optional[Type[BaseGateway]]:
+    """
+    按名称查找网关类，结果在进程内缓存，之后创建实例时不再导入模块和遍历属性
+    
+    Args:
+        name: 网关名称
+        
+    Returns:
+        网关类，未找到时返回None
+    """
+    # 内置网关按注册表直接取类
+    class_name = _GATEWAY_CLASS_NAMES.get(name)
+    if class_name is not None:
+        return getattr(gateway_package, class_name)
+    
+    module = _import_optional("senweaver_sms.gateway", name)
+    if module is None:
+        return None
+    
+    # 未注册的网关模块按 gateway_name 匹配，类名大小写与模块名不一致时也能找到，如 SmsBaoGateway；
+    # 没有匹配时使用模块中定义的第一个网关类，自定义了 gateway_name 的类也能找到
+    fallback = None
+    for value in vars(module).values():
+        if isinstance(value, type) and issubclass(value, BaseGateway) and value is not BaseGateway:
+            if value.gateway_name == name:
+                return value
+            if fallback is None and value.__module__ == module.__name__:
+                fallback = value
+    return fallback
+
+
+@lru_cache(maxsize=None)
+def _find_strategy_class(name: str) -> Optional[Type[BaseStrategy]]:
+    """
+    按名称查找策略类，结果在进程内缓存
+    
+    Args:
+        name: 策略名称
+        
+    Returns:
+        策略类，未找到时返回None
+    """
+    if name == "order":
+        return OrderStrategy
+    
+    module = _import_optional("senweaver_sms.strategy", name)
+    if module is None:
+        return None
+    
+    strategy_class_name = "".join(word.capitalize() for word in name.split("_")) + "Strategy"
+    return getattr(module, strategy_class_name, None)
+
+
 
 class SMSRequest:
     """
@@ -30,10 +116,11 @@ class SMSRequest:
         self.config = config
         self._strategies = {}
         self._gateways = {}
+        self._breakers = {}
     
     def send(self, 
              to: Union[str, PhoneNumber], 
-             content: str = None, 
+             content: Union[str, Message] = None, 
              template: str = None, 
              data: Dict[str, Any] = None,
              gateways: List[str] = None,
@@ -43,7 +130,7 @@ class SMSRequest:
         
         Args:
             to: 接收人手机号
-            content: 短信内容，与template二选一
+            content: 短信内容，与template二选一；也可以传入预先构建的 Message 对象
             template: 模板ID，与content二选一
             data: 模板参数
             gateways: 使用的网关列表，不指定则使用配置中的默认网关
@@ -56,27 +143,70 @@ class SMSRequest:
         phone = to if isinstance(to, PhoneNumber) else PhoneNumber(to)
         
         # 创建消息对象
-        message = Message(
+        message = self._make_message(content, template, data)
+        
+        # 选择网关
+        selected_gateways = self._select_gateways(message, gateways, strategy)
+        
+        # 发送消息
+        return self._send_message(phone, message, selected_gateways)
+        
+    def _make_message(self, content: Union[str, Message, None], template: Optional[str], data: Optional[Dict[str, Any]]) -> Message:
+        """
+        创建消息对象，传入的 content 已经是 Message 时直接复用
+        
+        Args:
+            content: 短信内容或消息对象
+            template: 模板ID
+            data: 模板参数
+            
+        Returns:
+            消息对象
+        """
+        if isinstance(content, Message):
+            return content
+        return Message(
             content=content,
             template=template,
             data=data or {}
         )
         
+    def _select_gateways(self, 
+                         message: Message, 
+                         gateways: Optional[List[str]] = None, 
+                         strategy: Optional[str] = None) -> Sequence[str]:
+        """
+        根据策略选择要尝试的网关
+        
+        Args:
+            message: 消息对象
+            gateways: 指定的网关列表
+            strategy: 指定的策略
+            
+        Returns:
+            按尝试顺序排列的网关名称列表
+        """
         # 确定使用的网关列表
         gateway_names = self._get_gateway_names(gateways)
         
         # 获取策略
         strategy_name = strategy or self.config.default_strategy
+        
+        # 默认发送顺序已按配置排好，顺序策略无需再处理
+        if not gateways and strategy_name == "order":
+            return gateway_names
+        
+        # 只有一个网关时无需策略排序，只保留已配置的网关
+        if len(gateway_names) == 1:
+            return gateway_names if gateway_names[0] in self.config.gateways else ()
+        
         strategy_instance = self._get_strategy(strategy_name)
         
         # 应用策略选择网关
         gateway_configs = self._get_gateway_configs(gateway_names)
-        selected_gateways = strategy_instance.apply(gateway_configs, message)
+        return strategy_instance.apply(gateway_configs, message)
         
-        # 发送消息
-        return self._send_message(phone, message, selected_gateways)
-        
-    def _get_gateway_names(self, gateways: Optional[List[str]] = None) -> List[str]:
+    def _get_gateway_names(self, gateways: Optional[List[str]] = None) -> Sequence[str]:
         """
         获取要使用的网关名称列表
         
@@ -93,13 +223,10 @@ class SMSRequest:
         if gateways:
             return gateways
             
-        # 如果有默认网关，使用默认网关
-        if self.config.default_gateway:
-            return [self.config.default_gateway]
-            
-        # 否则使用所有配置的网关
-        if self.config.gateways:
-            return list(self.config.gateways.keys())
+        # 有默认网关时使用默认网关，否则使用所有配置的网关
+        send_order = self.config.get_send_order()
+        if send_order:
+            return send_order
             
         # 没有可用的网关
         raise NoGatewaySelectedException("未指定任何网关，且没有配置默认网关")
@@ -114,10 +241,46 @@ class SMSRequest:
         Returns:
             网关实例
         """
-        if name not in self._gateways:
-            self._gateways[name] = self._create_gateway(name)
+        gateway = self._gateways.get(name)
+        if gateway is None:
+            # setdefault 保证并发发送时各线程拿到同一个实例
+            gateway = self._gateways.setdefault(name, self._create_gateway(name))
+            
+        return gateway
+        
+    def _get_breaker(self, name: str) -> CircuitBreaker:
+        """
+        获取网关的熔断器
+        
+        Args:
+            name: 网关名称
+            
+        Returns:
+            熔断器实例
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers.setdefault(name, CircuitBreaker())
+            
+        return breaker
+        
+    def _circuit_open_response(self, name: str, to: PhoneNumber) -> SMSResponse:
+        """
+        熔断器打开时的失败响应
+        
+        Args:
+            name: 网关名称
+            to: 接收人手机号
             
-        return self._gateways[name]
+        Returns:
+            失败响应对象
+        """
+        return SMSResponse.failed(
+            gateway=name,
+            phone_number=to.get_number(),
+            error_code="CIRCUIT_OPEN",
+            error_message=f"网关 {name} 连续请求失败，暂时跳过"
+        )
         
     def _get_strategy(self, name: str) -> BaseStrategy:
         """
@@ -144,12 +307,7 @@ class SMSRequest:
         Returns:
             网关配置字典
         """
-        configs = {}
-        for name in gateway_names:
-            config = self.config.get_gateway(name)
-            if config:
-                configs[name] = config
-        return configs
+        return self.config.get_gateway_configs(gateway_names)
         
     def _send_message(self, to: PhoneNumber, message: Message, gateway_names: List[str]) -> SMSResponse:
         """
@@ -166,35 +324,131 @@ class SMSRequest:
         Raises:
             NoGatewayAvailableException: 所有网关都发送失败时抛出
         """
+        hedge_delay = self.config.hedge_delay
+        if hedge_delay is not None and len(gateway_names) > 1:
+            return self._send_message_hedged(to, message, gateway_names, hedge_delay)
+        
         responses = SMSBatchResponse()
         
         for name in gateway_names:
-            try:
-                # 获取网关和配置
-                gateway = self._get_gateway(name)
-                config = self.config.get_gateway(name)
+            response = self._send_with_gateway(name, to, message)
+            if response is None:
+                continue
+            responses.add_response(response)
+            
+            # 如果发送成功，直接返回
+            if response.is_success:
+                return response
                 
-                if not config:
+        return self._resolve_failure(responses)
+        
+    def _send_message_hedged(self, to: PhoneNumber, message: Message, gateway_names: List[str], delay: float) -> SMSResponse:
+        """
+        对冲发送：按顺序启动网关，前一个网关失败或超过 delay 秒未返回时启动下一个，
+        返回第一个成功的响应
+        
+        已启动的网关无法取消，返回后仍在进行的请求会在后台完成，结果被丢弃
+        
+        Args:
+            to: 接收人手机号
+            message: 消息对象
+            gateway_names: 网关名称列表
+            delay: 启动下一个网关前的等待时间（秒）
+            
+        Returns:
+            发送结果
+            
+        Raises:
+            NoGatewayAvailableException: 所有网关都发送失败时抛出
+        """
+        responses = SMSBatchResponse()
+        names = iter(gateway_names)
+        pending = set()
+        executor = ThreadPoolExecutor(max_workers=len(gateway_names))
+        
+        def launch_next() -> bool:
+            for name in names:
+                pending.add(executor.submit(self._send_with_gateway, name, to, message))
+                return True
+            return False
+        
+        try:
+            exhausted = not launch_next()
+            while pending:
+                done, _ = wait(pending, timeout=None if exhausted else delay, return_when=FIRST_COMPLETED)
+                if not done:
+                    # 超时未返回，同时尝试下一个网关
+                    exhausted = not launch_next()
                     continue
-                    
-                # 发送短信
-                response = gateway.send(to, message, config)
-                responses.add_response(response)
                 
-                # 如果发送成功，直接返回
-                if response.is_success:
-                    return response
-            except Exception as e:
-                # 记录错误但继续尝试下一个网关
-                response = SMSResponse.failed(
-                    gateway=name,
-                    phone_number=to.get_number(),
-                    error_code="UNKNOWN_ERROR",
-                    error_message=str(e)
-                )
-                responses.add_response(response)
-                continue
+                for future in done:
+                    pending.discard(future)
+                    response = future.result()
+                    if response is None:
+                        continue
+                    responses.add_response(response)
+                    if response.is_success:
+                        return response
                 
+                # 已完成的网关都失败了，立即尝试下一个
+                if not exhausted:
+                    exhausted = not launch_next()
+        finally:
+            executor.shutdown(wait=False)
+        
+        return self._resolve_failure(responses)
+        
+    def _send_with_gateway(self, name: str, to: PhoneNumber, message: Message) -> Optional[SMSResponse]:
+        """
+        使用单个网关发送消息
+        
+        Args:
+            name: 网关名称
+            to: 接收人手机号
+            message: 消息对象
+            
+        Returns:
+            发送结果，网关未配置时返回None
+        """
+        try:
+            # 获取网关和配置
+            gateway = self._get_gateway(name)
+            config = self.config.get_gateway(name)
+            
+            if not config:
+                return None
+            
+            # 网关连续失败时直接跳过
+            breaker = self._get_breaker(name)
+            if not breaker.allow():
+                return self._circuit_open_response(name, to)
+                
+            # 发送短信
+            response = gateway.send(to, message, config)
+            breaker.record(response)
+            return response
+        except Exception as e:
+            # 记录错误，由调用方继续尝试下一个网关
+            return SMSResponse.failed(
+                gateway=name,
+                phone_number=to.get_number(),
+                error_code="UNKNOWN_ERROR",
+                error_message=str(e)
+            )
+        
+    def _resolve_failure(self, responses: SMSBatchResponse) -> SMSResponse:
+        """
+        处理所有网关都未发送成功的情况
+        
+        Args:
+            responses: 各网关的发送结果
+            
+        Returns:
+            最后一个响应
+            
+        Raises:
+            NoGatewayAvailableException: 所有网关都发送失败时抛出
+        """
         # 所有网关都发送失败，抛出异常
         if responses.is_failed:
             raise NoGatewayAvailableException(
@@ -222,21 +476,10 @@ class SMSRequest:
         Raises:
             InvalidArgumentException: 无法创建网关时抛出
         """
-        try:
-            import importlib
-            
-            # 尝试导入网关模块
-            module_name = f".gateway.{name}"
-            module = importlib.import_module(module_name, package="senweaver_sms")
-            
-            # 查找网关类
-            gateway_class_name = "".join(word.capitalize() for word in name.split("_")) + "Gateway"
-            if hasattr(module, gateway_class_name):
-                return getattr(module, gateway_class_name)()
-        except ImportError:
-            pass
-            
-        raise InvalidArgumentException(f"未找到网关: {name}")
+        gateway_class = _find_gateway_class(name)
+        if gateway_class is None:
+            raise InvalidArgumentException(f"未找到网关: {name}")
+        return gateway_class()
         
     def _create_strategy(self, name: str) -> BaseStrategy:
         """
@@ -251,24 +494,48 @@ class SMSRequest:
         Raises:
             InvalidArgumentException: 无法创建策略时抛出
         """
-        if name == "order":
-            return OrderStrategy()
-            
-        try:
-            import importlib
-            
-            # 尝试导入策略模块
-            module_name = f".strategy.{name}"
-            module = importlib.import_module(module_name, package="senweaver_sms")
-            
-            # 查找策略类
-            strategy_class_name = "".join(word.capitalize() for word in name.split("_")) + "Strategy"
-            if hasattr(module, strategy_class_name):
-                return getattr(module, strategy_class_name)()
-        except ImportError:
-            pass
-            
-        raise InvalidArgumentException(f"未找到策略: {name}")
+        strategy_class = _find_strategy_class(name)
+        if strategy_class is None:
+            raise InvalidArgumentException(f"未找到策略: {name}")
+        return strategy_class()
+        
+    def prewarm(self) -> threading.Thread:
+        """
+        在后台预先连接所有已配置网关的端点，减少首次发送的延迟
+        
+        Returns:
+            执行预热的守护线程
+        """
+        targets = {}
+        for name, config in self.config.gateways.items():
+            try:
+                url = self._get_gateway(name)._get_endpoint_url(config)
+            except Exception:
+                continue
+            if url:
+                targets[(url, config.ssl_verify)] = None
+        return prewarm_sessions(list(targets))
+        
+    def close(self, release_sessions: bool = False) -> None:
+        """
+        关闭请求对象，释放已创建的网关实例
+        
+        Args:
+            release_sessions: 是否同时关闭进程内共享的连接池会话 (其他请求对象也在使用，
+                一般只在进程退出前传入 True)
+        """
+        gateways = list(self._gateways.values())
+        self._gateways.clear()
+        for gateway in gateways:
+            gateway.close()
+        if release_sessions:
+            close_sessions()
+    
+    def __enter__(self) -> 'SMSRequest':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
         
     @classmethod
     def create(cls, config: SMSConfig) -> 'SMSRequest':
@@ -285,42 +552,73 @@ class SMSRequest:
 
     def batch_send(self, 
                    to_list: List[Union[str, PhoneNumber]], 
-                   content: str = None, 
+                   content: Union[str, Message] = None, 
                    template: str = None, 
                    data: Dict[str, Any] = None,
                    gateways: List[str] = None,
-                   strategy: str = None) -> SMSBatchResponse:
+                   strategy: str = None,
+                   max_workers: int = 32) -> SMSBatchResponse:
         """
         批量发送短信
         
+        发送耗时主要在等待网络响应，多个接收人时在线程池中并发发送，
+        所有请求共用连接池会话
+        
         Args:
             to_list: 接收人手机号列表
-            content: 短信内容
+            content: 短信内容或消息对象
             template: 模板ID
             data: 模板参数
             gateways: 使用的网关列表
             strategy: 使用的策略
+            max_workers: 最大并发请求数
             
         Returns:
-            批量发送结果
+            批量发送结果，顺序与 to_list 一致
         """
         # 创建批量响应对象
         batch_response = SMSBatchResponse()
         
-        # 逐个发送
-        for to in to_list:
+        # 所有接收人共用同一个消息对象
+        message = self._make_message(content, template, data)
+        
+        def send_one(to: Union[str, PhoneNumber]) -> SMSResponse:
+            # 手机号在各自的任务中只转换一次，格式错误的号码只影响自身
+            try:
+                phone = to if isinstance(to, PhoneNumber) else PhoneNumber(to)
+            except Exception as e:
+                return self._batch_failed_response(to, e)
             try:
-                response = self.send(to, content, template, data, gateways, strategy)
-                batch_response.add_response(response)
+                return self.send(phone, message, gateways=gateways, strategy=strategy)
             except Exception as e:
                 # 单个发送失败不影响其他发送
-                phone = to if isinstance(to, PhoneNumber) else PhoneNumber(to)
-                response = SMSResponse.failed(
-                    gateway="unknown",
-                    phone_number=phone.get_number(),
-                    error_code="SEND_FAILED",
-                    error_message=str(e)
-                )
-                batch_response.add_response(response)
+                return self._batch_failed_response(phone, e)
+        
+        workers = min(max_workers, len(to_list))
+        if workers <= 1:
+            responses = [send_one(to) for to in to_list]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = list(executor.map(send_one, to_list))
+        
+        batch_response.add_responses(responses)
                 
-        return batch_response 
\ No newline at end of file
+        return batch_response
+        
+    def _batch_failed_response(self, to: Union[str, PhoneNumber], e: BaseException) -> SMSResponse:
+        """
+        批量发送中单个接收人发送失败时的响应
+        
+        Args:
+            to: 接收人手机号，号码无法转换时为原始输入
+            e: 发送异常
+            
+        Returns:
+            失败响应对象
+        """
+        return SMSResponse.failed(
+            gateway="unknown",
+            phone_number=to.get_number() if isinstance(to, PhoneNumber) else repr(to),
+            error_code="SEND_FAILED",
+            error_message=str(e)
+        ) 
\ No newline at end of file
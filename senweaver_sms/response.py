@@ -1,11 +1,36 @@
 """
 短信响应类 - 统一的短信发送结果
 """
-from dataclasses import dataclass, field
+from dataclasses import field
 from enum import Enum
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterable, Optional, List, Tuple, Union
 from datetime import datetime
 
+from ._compat import slotted_dataclass
+
+
+class _EmptyDict(dict):
+    """
+    只读的空字典
+    
+    作为未提供原始响应、错误详情时的共享默认值，避免每个响应对象都创建一个空字典；
+    需要修改时先复制: dict(response.raw_response)
+    """
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("共享的空字典不可修改，请先复制")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+_EMPTY: Dict[str, Any] = _EmptyDict()
+
+
+def _empty() -> Dict[str, Any]:
+    return _EMPTY
+
 
 class SMSStatus(Enum):
     """
@@ -19,20 +44,20 @@ class SMSStatus(Enum):
     UNKNOWN = "unknown"      # 未知状态
 
 
-@dataclass
+@slotted_dataclass
 class SMSError:
     """
     短信错误信息
     """
     code: str                # 错误代码
     message: str             # 错误消息
-    details: Optional[Dict[str, Any]] = field(default_factory=dict)  # 详细错误信息
+    details: Optional[Dict[str, Any]] = field(default_factory=_empty)  # 详细错误信息
 
     def __str__(self) -> str:
         return f"{self.message} (错误代码: {self.code})"
 
 
-@dataclass
+@slotted_dataclass
 class SMSResponse:
     """
     短信响应类
@@ -52,7 +77,7 @@ class SMSResponse:
     error: Optional[SMSError] = None               # 错误信息
     
     # 原始信息
-    raw_response: Dict[str, Any] = field(default_factory=dict)   # 原始响应
+    raw_response: Dict[str, Any] = field(default_factory=_empty)   # 原始响应
     
     @property
     def is_success(self) -> bool:
@@ -62,7 +87,7 @@ class SMSResponse:
         Returns:
             是否成功
         """
-        return self.status == SMSStatus.SUCCESS
+        return self.status is SMSStatus.SUCCESS
     
     @property
     def is_failed(self) -> bool:
@@ -72,7 +97,7 @@ class SMSResponse:
         Returns:
             是否失败
         """
-        return self.status == SMSStatus.FAILED
+        return self.status is SMSStatus.FAILED
     
     @classmethod
     def success(cls, 
@@ -103,7 +128,7 @@ class SMSResponse:
             message_id=message_id,
             send_time=send_time or datetime.now(),
             fee=fee,
-            raw_response=raw_response or {}
+            raw_response=raw_response or _EMPTY
         )
     
     @classmethod
@@ -135,9 +160,9 @@ class SMSResponse:
             error=SMSError(
                 code=error_code,
                 message=error_message,
-                details=error_details or {}
+                details=error_details or _EMPTY
             ),
-            raw_response=raw_response or {}
+            raw_response=raw_response or _EMPTY
         )
     
     def __str__(self) -> str:
@@ -154,11 +179,13 @@ class SMSResponse:
             return f"短信发送失败 [网关: {self.gateway}] [手机号: {self.phone_number}] [错误: {error_msg}]"
 
 
-@dataclass
+@slotted_dataclass
 class SMSBatchResponse:
     """
     批量短信响应类
     用于处理多个接收人或多个网关的发送结果
+    
+    查询结果每次都从 responses 计算，直接修改 responses 或改变其中响应的状态后立即生效
     """
     responses: List[SMSResponse] = field(default_factory=list)
     
@@ -172,7 +199,7 @@ class SMSBatchResponse:
         """
         if not self.responses:
             return False
-        return all(response.is_success for response in self.responses)
+        return all(response.status is SMSStatus.SUCCESS for response in self.responses)
     
     @property
     def is_failed(self) -> bool:
@@ -184,6 +211,26 @@ class SMSBatchResponse:
         """
         return not self.is_success
     
+    @property
+    def success_count(self) -> int:
+        """
+        成功的响应数量
+        
+        Returns:
+            成功数量
+        """
+        return sum(1 for response in self.responses if response.status is SMSStatus.SUCCESS)
+    
+    @property
+    def failure_count(self) -> int:
+        """
+        失败的响应数量
+        
+        Returns:
+            失败数量
+        """
+        return sum(1 for response in self.responses if response.status is SMSStatus.FAILED)
+    
     def add_response(self, response: SMSResponse) -> None:
         """
         添加响应
@@ -193,6 +240,15 @@ class SMSBatchResponse:
         """
         self.responses.append(response)
     
+    def add_responses(self, responses: Iterable[SMSResponse]) -> None:
+        """
+        批量添加响应，与逐个调用 add_response 的结果一致
+        
+        Args:
+            responses: 短信响应对象序列
+        """
+        self.responses.extend(responses)
+    
     def get_success_responses(self) -> List[SMSResponse]:
         """
         获取所有成功的响应
@@ -200,7 +256,7 @@ class SMSBatchResponse:
         Returns:
             成功的响应列表
         """
-        return [response for response in self.responses if response.is_success]
+        return [response for response in self.responses if response.status is SMSStatus.SUCCESS]
     
     def get_failed_responses(self) -> List[SMSResponse]:
         """
@@ -209,7 +265,23 @@ class SMSBatchResponse:
         Returns:
             失败的响应列表
         """
-        return [response for response in self.responses if response.is_failed]
+        return [response for response in self.responses if response.status is SMSStatus.FAILED]
+        
+    def partition(self) -> Tuple[List[SMSResponse], List[SMSResponse]]:
+        """
+        同时获取成功和失败的响应，只遍历一次响应列表
+        
+        Returns:
+            (成功的响应列表, 失败的响应列表)
+        """
+        success, failed = [], []
+        for response in self.responses:
+            status = response.status
+            if status is SMSStatus.SUCCESS:
+                success.append(response)
+            elif status is SMSStatus.FAILED:
+                failed.append(response)
+        return success, failed
         
     def get_gateway_responses(self, gateway: str) -> List[SMSResponse]:
         """
@@ -230,6 +302,5 @@ class SMSBatchResponse:
         Returns:
             对象的字符串表示
         """
-        success_count = len(self.get_success_responses())
-        failed_count = len(self.get_failed_responses())
-        return f"批量短信发送结果 [成功: {success_count}] [失败: {failed_count}] [总计: {len(self.responses)}]" 
\ No newline at end of file
+        success, failed = self.partition()
+        return f"批量短信发送结果 [成功: {len(success)}] [失败: {len(failed)}] [总计: {len(self.responses)}]"
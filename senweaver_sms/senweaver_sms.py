@@ -1,4 +1,3 @@
-import importlib
 import inspect
 from typing import Dict, Any, List, Union, Callable, Type
 
@@ -9,6 +8,7 @@ from .gateway import BaseGateway
 from .exception import NoGatewayAvailableException
 from .exception import NoGatewaySelectedException
 from .exception import InvalidArgumentException
+from .request import _find_gateway_class, _find_strategy_class
 
 class SenWeaverSMS:
     """
@@ -47,15 +47,22 @@ class SenWeaverSMS:
         if isinstance(message, dict):
             message = Message(**message)
 
+        config = self.config
+        defaults = config.get('default') or {}
+
         # Get default gateways if not provided
         if gateways is None:
-            gateways = message.get_gateways() or self.get_config().get('default', {}).get('gateways', [])
+            gateways = message.get_gateways() or defaults.get('gateways', [])
 
         if not gateways:
             raise NoGatewaySelectedException('No gateway selected.')
 
+        # A single gateway needs no ordering, skip the strategy
+        if len(gateways) == 1:
+            return self._send_message(to, message, [gateway for gateway in gateways if gateway in config])
+
         # Get strategy from message or default
-        strategy_name = message.get_strategy() or self.get_config().get('default', {}).get('strategy')
+        strategy_name = message.get_strategy() or defaults.get('strategy')
         strategy = self.get_strategy(strategy_name)
 
         # Apply strategy to get order of gateways
@@ -129,11 +136,8 @@ class SenWeaverSMS:
         Returns:
             Dict[str, Any]: The gateway configurations
         """
-        configs = {}
-        for gateway in gateways:
-            if gateway in self.config:
-                configs[gateway] = self.config[gateway]
-        return configs
+        config = self.config
+        return {gateway: config[gateway] for gateway in gateways if gateway in config}
 
     def _send_message(self, to: Union[str, PhoneNumber], message: BaseMessage, gateway_names: List[str]) -> Dict[str, Any]:
         """
@@ -151,6 +155,7 @@ class SenWeaverSMS:
             Dict[str, Any]: The responses from the gateways
         """
         responses = {}
+        results = {}
         last_exception = None
 
         for gateway_name in gateway_names:
@@ -161,10 +166,11 @@ class SenWeaverSMS:
                 return responses
             except Exception as e:
                 last_exception = e
+                results[gateway_name] = {'status': 'failure', 'exception': e}
                 continue
 
         if last_exception:
-            raise NoGatewayAvailableException('No gateway could send the message.') from last_exception
+            raise NoGatewayAvailableException('No gateway could send the message.', results=results) from last_exception
 
         return responses
 
@@ -184,13 +190,9 @@ class SenWeaverSMS:
         if name in self._gateway_factory:
             return self._gateway_factory[name]()
 
-        try:
-            module = importlib.import_module(f'.gateways.{name}', package='senweaver_sms')
-            for item in dir(module):
-                if item.endswith('Gateway') and item != 'Gateway':
-                    return getattr(module, item)()
-        except ImportError:
-            pass
+        gateway_class = _find_gateway_class(name)
+        if gateway_class is not None:
+            return gateway_class()
 
         raise InvalidArgumentException(f'Gateway "{name}" not found.')
 
@@ -207,12 +209,8 @@ class SenWeaverSMS:
         Raises:
             InvalidArgumentException: When the strategy is not found
         """
-        try:
-            module = importlib.import_module(f'.strategy.{name}', package='senweaver_sms')
-            for item in dir(module):
-                if item.endswith('Strategy') and item != 'Strategy':
-                    return getattr(module, item)()
-        except ImportError:
-            pass
+        strategy_class = _find_strategy_class(name)
+        if strategy_class is not None:
+            return strategy_class()
 
         raise InvalidArgumentException(f'Strategy "{name}" not found.') 
\ No newline at end of file
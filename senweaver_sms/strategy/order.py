@@ -29,4 +29,4 @@ class OrderStrategy(BaseStrategy):
             网关名称列表，按照配置顺序排序
         """
         # 保持原始顺序
-        return list(gateways.keys()) 
\ No newline at end of file
+        return list(gateways) 
\ No newline at end of file
@@ -21,6 +21,11 @@ class RandomStrategy(BaseStrategy):
         Returns:
             List[str]: Randomized list of gateway names
         """
-        gateway_names = list(gateways.keys())
+        gateway_names = list(gateways)
+        if len(gateway_names) == 2:
+            # Two gateways only need a coin flip
+            if random.random() < 0.5:
+                gateway_names.reverse()
+            return gateway_names
         random.shuffle(gateway_names)
         return gateway_names 
\ No newline at end of file
@@ -33,6 +33,14 @@ setup(
     install_requires=[
         'requests>=2.20.0',
     ],
+    extras_require={
+        'async': ['aiohttp>=3.8'],
+        'fast': [
+            'orjson>=3.6',
+            'uvloop>=0.17; sys_platform != "win32"',
+            'winloop; sys_platform == "win32"',
+        ],
+    },
     project_urls={
         'Bug Reports': 'https://github.com/senweaver/senweaver-sms/issues',
         'Source': 'https://github.com/senweaver/senweaver-sms',
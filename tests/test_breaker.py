@@ -0,0 +1,52 @@
+"""
+Tests for CircuitBreaker.
+"""
+
+import unittest
+from senweaver_sms import SMSResponse
+from senweaver_sms.breaker import CircuitBreaker
+
+
+def failed(code):
+    return SMSResponse.failed(gateway='mock', phone_number='13800000000', error_code=code, error_message='error')
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """Test the CircuitBreaker class."""
+
+    def test_opens_after_transport_failures(self):
+        """Test the breaker opens after consecutive request failures."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record(failed('TIMEOUT'))
+        self.assertTrue(breaker.allow())
+        breaker.record(failed('REQUEST_ERROR'))
+        self.assertFalse(breaker.allow())
+
+    def test_ignores_business_errors(self):
+        """Test gateway business errors do not open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record(failed('isv.MOBILE_NUMBER_ILLEGAL'))
+        self.assertTrue(breaker.allow())
+
+    def test_success_resets(self):
+        """Test a success resets the consecutive failure count."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record(failed('TIMEOUT'))
+        breaker.record(SMSResponse.success(gateway='mock', phone_number='13800000000'))
+        breaker.record(failed('TIMEOUT'))
+        self.assertTrue(breaker.allow())
+
+    def test_opens_on_failure_rate(self):
+        """Test alternating failures open the breaker once the window is full."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, window=4, failure_rate=0.5)
+        success = SMSResponse.success(gateway='mock', phone_number='13800000000')
+        for response in (failed('TIMEOUT'), success, failed('TIMEOUT')):
+            breaker.record(response)
+            self.assertTrue(breaker.allow())
+        breaker.record(success)
+        breaker.record(failed('TIMEOUT'))
+        self.assertFalse(breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
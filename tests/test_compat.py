@@ -0,0 +1,47 @@
+"""
+Tests for the Python version compatibility helpers.
+"""
+
+import dataclasses
+import unittest
+from dataclasses import field
+
+from senweaver_sms._compat import _add_slots, slotted_dataclass
+
+
+class SlottedDataclassTest(unittest.TestCase):
+    """Test slotted dataclasses behave the same on every supported version."""
+
+    def make_class(self, decorate):
+        @decorate
+        class Example:
+            name: str
+            cached: object = field(default=None, init=False)
+            items: list = field(default_factory=list, init=False)
+            seen: bool = field(default=False, init=False)
+
+            def __post_init__(self):
+                self.seen = self.cached is None
+
+        return Example
+
+    def test_init_false_defaults(self):
+        """Test init=False fields with a plain default are set before __post_init__."""
+        decorators = [slotted_dataclass, lambda cls: _add_slots(dataclasses.dataclass(cls))]
+        for decorate in decorators:
+            with self.subTest(decorate=decorate):
+                example = self.make_class(decorate)('a')
+                self.assertIsNone(example.cached)
+                self.assertTrue(example.seen)
+                self.assertEqual([], example.items)
+                self.assertFalse(hasattr(example, '__dict__'))
+
+    def test_slots(self):
+        """Test the rebuilt class keeps its fields as slots."""
+        cls = _add_slots(dataclasses.dataclass(type('Plain', (), {'__annotations__': {'value': int}})))
+        self.assertEqual(('value',), cls.__slots__)
+        self.assertEqual(1, cls(1).value)
+
+
+if __name__ == '__main__':
+    unittest.main()
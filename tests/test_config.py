@@ -0,0 +1,75 @@
+"""
+Tests for SMSConfig and GatewayConfig.
+"""
+
+import unittest
+from senweaver_sms import SMSConfig, GatewayConfig
+from senweaver_sms.gateway.qiniu import QiniuGateway
+from senweaver_sms.gateway.yunpian import YunpianGateway
+
+
+class SMSConfigTest(unittest.TestCase):
+    """Test the SMSConfig class."""
+
+    def setUp(self):
+        self.config = SMSConfig(gateways={
+            'aliyun': GatewayConfig(app_id='id'),
+            'qcloud': GatewayConfig(app_id='id'),
+        })
+
+    def test_send_order_uses_default_gateway(self):
+        """Test the default gateway is used when no gateways are specified."""
+        self.assertEqual(('aliyun',), self.config.get_send_order())
+
+    def test_send_order_invalidated(self):
+        """Test changing the default gateway refreshes the cached order."""
+        self.config.get_send_order()
+        self.config.set_default_gateway('qcloud')
+        self.assertEqual(('qcloud',), self.config.get_send_order())
+
+    def test_send_order_follows_direct_assignment(self):
+        """Test fields assigned directly are reflected in the send order."""
+        self.config.get_send_order()
+        self.config.default_gateway = 'qcloud'
+        self.assertEqual(('qcloud',), self.config.get_send_order())
+        self.config.default_gateway = None
+        self.assertEqual(('aliyun', 'qcloud'), self.config.get_send_order())
+
+    def test_gateway_configs_follow_gateways_assignment(self):
+        """Test replacing the gateways dict clears the configs cached by name."""
+        self.assertEqual(['aliyun'], list(self.config.get_gateway_configs(['aliyun', 'other'])))
+        self.config.gateways = {'other': GatewayConfig(app_id='id')}
+        self.assertEqual(['other'], list(self.config.get_gateway_configs(['aliyun', 'other'])))
+
+    def test_gateway_configs_follow_name_order(self):
+        """Test gateway configs keep the requested order and refresh when gateways change."""
+        self.assertEqual(['qcloud', 'aliyun'], list(self.config.get_gateway_configs(['qcloud', 'missing', 'aliyun'])))
+        self.config.add_gateway('missing', GatewayConfig(app_id='id'))
+        self.assertEqual(['qcloud', 'missing', 'aliyun'], list(self.config.get_gateway_configs(['qcloud', 'missing', 'aliyun'])))
+
+    def test_gateway_cache_cleared_on_change(self):
+        """Test validation runs again after a field is changed after the first send."""
+        config = GatewayConfig(app_key='key')
+        gateway = YunpianGateway()
+        gateway._check_config(config)
+        config.app_key = None
+        with self.assertRaises(ValueError):
+            gateway._check_config(config)
+
+    def test_gateway_cache_per_gateway_class(self):
+        """Test a config validated by one gateway is still validated by another."""
+        config = GatewayConfig(app_key='key')
+        YunpianGateway()._check_config(config)
+        with self.assertRaises(ValueError):
+            QiniuGateway()._check_config(config)
+
+    def test_gateway_to_dict(self):
+        """Test to_dict skips unset and internal fields."""
+        self.assertEqual(
+            {'app_id': 'id', 'timeout': 5.0, 'ssl_verify': True, 'max_retries': 0},
+            self.config.get_gateway('aliyun').to_dict()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""
+Tests for the package exceptions.
+"""
+
+import unittest
+from senweaver_sms.exception import NoGatewayAvailableException
+
+
+class NoGatewayAvailableExceptionTest(unittest.TestCase):
+    """Test the NoGatewayAvailableException class."""
+
+    def test_exceptions_from_results(self):
+        """Test failed gateway exceptions are collected from results in order."""
+        first, second = ValueError('first'), ValueError('second')
+        e = NoGatewayAvailableException('failed', {'results': {
+            'aliyun': {'status': 'failure', 'exception': first},
+            'qcloud': {'status': 'success'},
+            'huawei': {'status': 'failure', 'exception': second},
+        }})
+        self.assertEqual({'aliyun': first, 'huawei': second}, e.get_exceptions())
+        self.assertIs(first, e.get_exception('aliyun'))
+        self.assertIs(second, e.get_last_exception())
+
+    def test_no_exceptions(self):
+        """Test the accessors work without any recorded results."""
+        e = NoGatewayAvailableException('failed')
+        self.assertEqual({}, e.get_results())
+        self.assertIsNone(e.get_last_exception())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,267 @@
+"""
+Tests for gateway request building and response parsing.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from senweaver_sms import Message, PhoneNumber
+from senweaver_sms import _http
+from senweaver_sms.config import GatewayConfig
+from senweaver_sms.gateway.aliyun import AliyunGateway
+from senweaver_sms.gateway.baidu import BaiduGateway
+from senweaver_sms.gateway.huawei import HuaweiGateway
+from senweaver_sms.gateway.qcloud import QcloudGateway
+from senweaver_sms.gateway.qiniu import QiniuGateway
+from senweaver_sms.gateway.smsbao import SmsBaoGateway
+from senweaver_sms.gateway.ucloud import UcloudGateway
+from senweaver_sms.gateway.yunpian import YunpianGateway
+
+
+class BulkGatewayTest(unittest.TestCase):
+    """Test the provider-native bulk requests."""
+
+    def setUp(self):
+        self.config = GatewayConfig(app_id='1400000000', app_key='key', app_secret='secret', sign='sign')
+        self.message = Message(template='SMS_001', data={'code': '1234'})
+        self.phones = [PhoneNumber('13800000000'), PhoneNumber('13800000001')]
+
+    def test_aliyun_bulk_request(self):
+        """Test Aliyun bulk sends join the phones into one SendSms request."""
+        params = AliyunGateway()._build_bulk_request(self.phones, self.message, self.config)['params']
+        self.assertEqual('SendSms', params['Action'])
+        self.assertEqual('13800000000,13800000001', params['PhoneNumbers'])
+        self.assertEqual('sign', params['SignName'])
+        self.assertEqual({'code': '1234'}, json.loads(params['TemplateParam']))
+        self.assertIn('Signature', params)
+
+    def test_baidu_bulk_responses(self):
+        """Test Baidu per-mobile results are split into separate responses."""
+        gateway = BaiduGateway()
+        config = GatewayConfig(app_id='id', app_key='key', invoke_id='invoke')
+        body = gateway._build_bulk_request(self.phones, self.message, config)['json']
+        self.assertEqual('13800000000,13800000001', body['phoneNumber'])
+
+        responses = gateway._bulk_responses(self.phones, self.message, {
+            'requestId': 'req-1',
+            'code': '1000',
+            'data': [
+                {'mobile': '13800000000', 'code': '1000', 'messageId': 'm-1'},
+                {'mobile': '13800000001', 'code': '1004', 'message': 'blocked'},
+            ]
+        })
+        self.assertTrue(responses[0].is_success)
+        self.assertEqual('req-1', responses[0].message_id)
+        self.assertTrue(responses[1].is_failed)
+        self.assertEqual('1004', responses[1].error.code)
+
+    def test_qcloud_bulk_responses(self):
+        """Test Tencent Cloud per-phone statuses are split into separate responses."""
+        gateway = QcloudGateway()
+        body = json.loads(gateway._build_bulk_request(self.phones, self.message, self.config)['data'])
+        self.assertEqual(['+8613800000000', '+8613800000001'], body['PhoneNumberSet'])
+
+        responses = gateway._bulk_responses(self.phones, self.message, {
+            'SendStatusSet': [
+                {'PhoneNumber': '+8613800000000', 'Code': 'Ok', 'SerialNo': 'serial-1'},
+                {'PhoneNumber': '+8613800000001', 'Code': 'LimitExceeded', 'Message': 'limit'},
+            ]
+        })
+        self.assertTrue(responses[0].is_success)
+        self.assertEqual('serial-1', responses[0].message_id)
+        self.assertTrue(responses[1].is_failed)
+        self.assertEqual('LimitExceeded', responses[1].error.code)
+
+    def test_partial_bulk_responses(self):
+        """Test numbers missing from the per-number results are reported as failed."""
+        cases = [
+            (QcloudGateway(), {'SendStatusSet': [{'PhoneNumber': '+8613800000000', 'Code': 'Ok'}]}),
+            (HuaweiGateway(), {'code': '000000', 'result': [{'originTo': '13800000000', 'status': '000000'}]}),
+            (BaiduGateway(), {'code': '1000', 'data': [{'mobile': '13800000000', 'code': '1000'}]}),
+        ]
+        for gateway, response in cases:
+            with self.subTest(gateway=gateway.gateway_name):
+                responses = gateway._bulk_responses(self.phones, self.message, response)
+                self.assertTrue(responses[0].is_success)
+                self.assertTrue(responses[1].is_failed)
+                self.assertEqual('MISSING_STATUS', responses[1].error.code)
+                self.assertEqual('13800000001', responses[1].phone_number)
+
+    def test_qcloud_config_values_refreshed(self):
+        """Test cached per-config parameters are rebuilt after a field is set directly."""
+        gateway = QcloudGateway()
+        body = json.loads(gateway._build_bulk_request(self.phones, self.message, self.config)['data'])
+        self.assertEqual('sign', body['SignName'])
+
+        self.config.sign = 'other'
+        body = json.loads(gateway._build_bulk_request(self.phones, self.message, self.config)['data'])
+        self.assertEqual('other', body['SignName'])
+
+
+class SignedBodyTest(unittest.TestCase):
+    """Test signatures cover the exact bytes that are sent."""
+
+    def test_qiniu_signs_sent_body(self):
+        """Test the Qiniu token is computed over the request body as sent."""
+        config = GatewayConfig(app_id='ak', app_key='sk')
+        request = QiniuGateway()._build_request(
+            PhoneNumber('13800000000'), Message(template='T1', data={'code': '中文'}), config
+        )
+        self.assertNotIn('json', request)
+        signed = b'POST /v1/message\nHost: sms.qiniuapi.com\nContent-Type: application/json\n\n' + request['data']
+        signature = base64.urlsafe_b64encode(hmac.digest(b'sk', signed, 'sha1')).decode()
+        self.assertEqual(f'Qiniu ak:{signature}', request['headers']['Authorization'])
+        self.assertEqual('中文', json.loads(request['data'])['parameters']['code'])
+        self.assertIn('中文'.encode('utf-8'), request['data'])
+
+    def test_huawei_fresh_nonce_per_request(self):
+        """Test every Huawei request is signed with its own nonce."""
+        gateway = HuaweiGateway()
+        first = gateway._get_auth_headers('key', 'secret')
+        second = gateway._get_auth_headers('key', 'secret')
+        self.assertNotEqual(first['X-Nonce'], second['X-Nonce'])
+        for headers in (first, second):
+            signed = f"secret{headers['X-Nonce']}{headers['X-Timestamp']}".encode()
+            self.assertEqual(hashlib.sha256(signed).hexdigest(), headers['X-Signature'])
+
+    def test_ucloud_template_params_compact(self):
+        """Test UCloud template parameters are signed as compact, unescaped JSON."""
+        config = GatewayConfig(app_id='pk', app_key='sk', sign='sign')
+        params = UcloudGateway()._build_request(
+            PhoneNumber('13800000000'), Message(template='T1', data={'name': '张三', 'code': '1234'}), config
+        )['data']
+        self.assertEqual('["张三","1234"]', params['TemplateParams'])
+
+
+class ConfigChangeTest(unittest.TestCase):
+    """Test values derived from the config follow direct field changes."""
+
+    def setUp(self):
+        self.phone = PhoneNumber('13800000000')
+        self.message = Message(content='hello')
+
+    def test_smsbao_password_rotated(self):
+        """Test SmsBao signs with the new password hash after app_key is rotated."""
+        gateway = SmsBaoGateway()
+        config = GatewayConfig(app_id='user', app_key='old')
+        self.assertEqual(hashlib.md5(b'old').hexdigest(), gateway._build_request(self.phone, self.message, config)['params']['p'])
+        config.app_key = 'new'
+        self.assertEqual(hashlib.md5(b'new').hexdigest(), gateway._build_request(self.phone, self.message, config)['params']['p'])
+
+    def test_aliyun_key_rotated(self):
+        """Test Aliyun signs with the new secret after app_key is rotated."""
+        gateway = AliyunGateway()
+        config = GatewayConfig(app_id='id', app_key='old', sign='sign')
+        gateway._build_request(self.phone, Message(template='T1'), config)
+        config.app_key = 'new'
+        params = gateway._build_request(self.phone, Message(template='T1'), config)['params']
+        signature = params.pop('Signature')
+        expected = AliyunGateway()._create_signer(GatewayConfig(app_id='id', app_key='new', sign='sign'))(params)
+        self.assertEqual(expected, signature)
+
+    def test_yunpian_sign_changed(self):
+        """Test Yunpian uses the new sign prefix after sign is changed."""
+        gateway = YunpianGateway()
+        config = GatewayConfig(app_key='key', sign='old')
+        self.assertEqual('【old】hello', gateway._build_request(self.phone, self.message, config)['data']['text'])
+        config.sign = 'new'
+        self.assertEqual('【new】hello', gateway._build_request(self.phone, self.message, config)['data']['text'])
+
+
+class _BytesResponse:
+    """A response exposing only the status code and raw body."""
+
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+
+class ResponseParsingTest(unittest.TestCase):
+    """Test JSON responses are parsed from the raw bytes."""
+
+    def test_success_responses_parsed_from_bytes(self):
+        """Test success responses are parsed without response.json() or text decoding."""
+        self.assertEqual(123, YunpianGateway()._parse_response(_BytesResponse(b'{"code":0,"sid":123}'))['sid'])
+        self.assertEqual('s-1', UcloudGateway()._parse_response(_BytesResponse(b'{"RetCode":0,"SessionNo":"s-1"}'))['SessionNo'])
+        self.assertEqual('j-1', QiniuGateway()._parse_response(_BytesResponse(b'{"job_id":"j-1"}'))['job_id'])
+
+    def test_message_id_is_string(self):
+        """Test numeric message IDs are reported as strings."""
+        gateway = YunpianGateway()
+        self.assertEqual('123', gateway._extract_message_id({'code': 0, 'sid': 123}))
+        self.assertIsNone(gateway._extract_message_id({'code': 0}))
+
+
+class RetryTest(unittest.TestCase):
+    """Test the request retry loop driven by max_retries."""
+
+    def setUp(self):
+        self.gateway = HuaweiGateway()
+        self.config = GatewayConfig(app_id='key', app_key='secret', channel='channel', max_retries=2)
+        self.session = mock.Mock()
+        self.gateway._get_session = mock.Mock(return_value=self.session)
+        patcher = mock.patch('senweaver_sms.gateway.base.RETRY_BACKOFF_BASE', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def response(self, status_code, content=b'{"code":"000000","result":[{"smsMsgId":"m-1"}]}'):
+        return _http.AsyncHTTPResponse(status_code, content, 'https://smsapi.example.com')
+
+    def send(self, *outcomes):
+        self.session.request.side_effect = list(outcomes)
+        return self.gateway.send(PhoneNumber('13800000000'), Message(template='T1'), self.config)
+
+    def nonces(self, calls):
+        return [call.kwargs['headers']['X-Nonce'] for call in calls]
+
+    def test_retry_connection_error(self):
+        """Test failed connections are retried."""
+        self.assertTrue(self.send(requests.exceptions.ConnectionError(), self.response(200)).is_success)
+        self.assertEqual(2, self.session.request.call_count)
+
+    def test_retry_server_error(self):
+        """Test 5xx responses are retried."""
+        self.assertTrue(self.send(self.response(503, b''), self.response(200)).is_success)
+        self.assertEqual(2, self.session.request.call_count)
+
+    def test_no_retry(self):
+        """Test 4xx responses and read timeouts are not retried."""
+        for outcome in (self.response(400, b''), requests.exceptions.ReadTimeout()):
+            with self.subTest(outcome=outcome):
+                self.session.reset_mock()
+                self.assertTrue(self.send(outcome, self.response(200)).is_failed)
+                self.assertEqual(1, self.session.request.call_count)
+
+    def test_stops_at_max_retries(self):
+        """Test the request is sent at most max_retries + 1 times."""
+        response = self.send(*[requests.exceptions.ConnectionError()] * 4)
+        self.assertTrue(response.is_failed)
+        self.assertEqual(3, self.session.request.call_count)
+
+    def test_fresh_nonce_per_attempt(self):
+        """Test every attempt is signed again instead of replaying the first signature."""
+        self.send(self.response(502, b''), self.response(503, b''), self.response(200))
+        nonces = self.nonces(self.session.request.call_args_list)
+        self.assertEqual(3, len(set(nonces)))
+
+    def test_fresh_nonce_per_attempt_async(self):
+        """Test the async path rebuilds the request for each attempt as well."""
+        fetch = mock.AsyncMock(side_effect=[requests.exceptions.ConnectionError(), self.response(200)])
+        with mock.patch('senweaver_sms.gateway.base.fetch_async', fetch):
+            response = asyncio.run(self.gateway.send_async(
+                PhoneNumber('13800000000'), Message(template='T1'), self.config, session=mock.Mock()
+            ))
+        self.assertTrue(response.is_success)
+        nonces = [call.args[1]['headers']['X-Nonce'] for call in fetch.call_args_list]
+        self.assertEqual(2, len(set(nonces)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for the shared HTTP helpers.
+"""
+
+import asyncio
+import gc
+import unittest
+import warnings
+from unittest import mock
+
+import requests
+
+from senweaver_sms import GatewayConfig, Message, PhoneNumber
+from senweaver_sms import _http
+from senweaver_sms.gateway.yunpian import YunpianGateway
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class SessionRetryTest(unittest.TestCase):
+    """Test the shared requests session leaves retries to the gateway."""
+
+    def test_no_adapter_retries(self):
+        """Test connect, read and status retries are all left to the gateway's max_retries."""
+        session = _http.get_session('https://retry.example.com/send')
+        retry = session.get_adapter('https://retry.example.com/send').max_retries
+        self.assertEqual(0, retry.total)
+        self.assertIs(False, retry.read)
+        self.assertFalse(retry.is_retry('POST', 503))
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class DefaultAsyncSessionTest(unittest.TestCase):
+    """Test the per-loop default aiohttp session."""
+
+    def test_closed_with_loop(self):
+        """Test repeated asyncio.run calls leave no sessions or loops behind."""
+        gateway = YunpianGateway()
+        config = GatewayConfig(app_key='key')
+        response = _http.AsyncHTTPResponse(200, b'{"code":0,"sid":1}', YunpianGateway.endpoint)
+
+        fetch = mock.AsyncMock(return_value=response)
+        with mock.patch('senweaver_sms.gateway.base.fetch_async', fetch):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                for _ in range(3):
+                    result = asyncio.run(gateway.send_async(PhoneNumber('13800000000'), Message(content='hi'), config))
+                    self.assertTrue(result.is_success)
+                self.assertTrue(all(call.args[0].closed for call in fetch.call_args_list))
+                # The recorded calls keep the sessions alive
+                fetch.reset_mock()
+                gc.collect()
+
+        self.assertEqual(0, len(_http._ASYNC_SESSIONS))
+        self.assertEqual([], [obj for obj in gc.get_objects() if isinstance(obj, aiohttp.ClientSession)])
+        self.assertEqual([], [w for w in caught if issubclass(w.category, ResourceWarning)])
+
+    def test_close_async_session(self):
+        """Test the default session can be closed explicitly and is recreated afterwards."""
+        async def run():
+            first = await _http.get_async_session()
+            self.assertIs(first, await _http.get_async_session())
+            await _http.close_async_session()
+            self.assertTrue(first.closed)
+            second = await _http.get_async_session()
+            self.assertIsNot(first, second)
+            return second
+
+        self.assertTrue(asyncio.run(run()).closed)
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class FetchAsyncTest(unittest.TestCase):
+    """Test aiohttp requests are mapped onto the requests API."""
+
+    def fetch(self, session):
+        request = {'method': 'POST', 'url': 'https://sms.example.com/send', 'json': {}}
+        return asyncio.run(_http.fetch_async(session, request, timeout=1.0))
+
+    def failing_session(self, error):
+        session = mock.MagicMock()
+        session.request.return_value.__aenter__.side_effect = error
+        return session
+
+    def test_response(self):
+        """Test the status, body and URL are read from the aiohttp response."""
+        resp = mock.MagicMock(status=200, url='https://sms.example.com/send', reason='OK', charset='utf-8')
+        resp.read = mock.AsyncMock(return_value=b'{"code":0}')
+        session = mock.MagicMock()
+        session.request.return_value.__aenter__.return_value = resp
+
+        response = self.fetch(session)
+        self.assertEqual((200, b'{"code":0}'), (response.status_code, response.content))
+        self.assertEqual({'code': 0}, response.json())
+        self.assertEqual('POST', session.request.call_args.args[0])
+
+    def test_error_mapping(self):
+        """Test aiohttp errors are raised as the matching requests exceptions."""
+        cases = [
+            (asyncio.TimeoutError(), requests.exceptions.Timeout),
+            (aiohttp.ClientConnectionError('refused'), requests.exceptions.ConnectionError),
+            (aiohttp.ClientPayloadError('truncated'), requests.exceptions.RequestException),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=type(error).__name__):
+                with self.assertRaises(expected) as caught:
+                    self.fetch(self.failing_session(error))
+                self.assertIs(error, caught.exception.__cause__)
+
+    def test_client_error_not_connection_error(self):
+        """Test other client errors are not reported as retryable connection errors."""
+        with self.assertRaises(requests.exceptions.RequestException) as caught:
+            self.fetch(self.failing_session(aiohttp.ClientPayloadError('truncated')))
+        self.assertNotIsInstance(caught.exception, requests.exceptions.ConnectionError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -45,6 +45,19 @@ class MessageTest(unittest.TestCase):
         message = Message(data=lambda g: {'code': 1234, 'gateway': g.get_name()})
         self.assertEqual({'code': 1234, 'gateway': 'mock'}, message.get_data(gateway))
 
+    def test_get_data_json_tracks_changes(self):
+        """Test the cached JSON follows changes to the data."""
+        message = Message(data={'code': '1234'})
+        self.assertEqual('{"code":"1234"}', message.get_data_json())
+        message.data['code'] = '5678'
+        self.assertEqual('{"code":"5678"}', message.get_data_json())
+
+    def test_get_data_json_shared_between_messages(self):
+        """Test equal string data in separate messages serializes to the same JSON."""
+        first = Message(data={'code': '1234'}).get_data_json()
+        self.assertIs(first, Message(data={'code': '1234'}).get_data_json())
+        self.assertEqual('{"code":true}', Message(data={'code': True}).get_data_json())
+
     def test_get_strategy(self):
         """Test getting the strategy."""
         message = Message(strategy='order')
@@ -0,0 +1,159 @@
+"""
+Tests for SMSRequest gateway failover.
+"""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+from senweaver_sms import AsyncSMSRequest, GatewayConfig, SMSBuilder, SMSConfig, SMSRequest, SMSResponse
+
+
+class SlowGateway:
+    """A gateway that succeeds after a delay."""
+
+    supports_bulk = False
+
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.cancelled = False
+        self.sent = []
+
+    def send(self, to, message, config):
+        time.sleep(self.delay)
+        return SMSResponse.success(gateway=self.name, phone_number=to.get_number())
+
+    async def send_async(self, to, message, config, session=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        self.sent.append(to.get_number())
+        return SMSResponse.success(gateway=self.name, phone_number=to.get_number())
+
+
+class BulkGateway(SlowGateway):
+    """A bulk-capable gateway that only delivers to the first number of each request."""
+
+    supports_bulk = True
+    bulk_limit = 100
+
+    async def send_bulk_async(self, phones, message, config, session=None):
+        return [SMSResponse.success(gateway=self.name, phone_number=phones[0].get_number())] + [
+            SMSResponse.failed(gateway=self.name, phone_number=phone.get_number(), error_code='E1', error_message='error')
+            for phone in phones[1:]
+        ]
+
+
+class HedgedSendTest(unittest.TestCase):
+    """Test hedged sends start the next gateway when the current one is slow."""
+
+    def make_request(self, request_class, hedge_delay):
+        config = SMSConfig(
+            gateways={'slow': GatewayConfig(app_id='id'), 'fast': GatewayConfig(app_id='id')},
+            hedge_delay=hedge_delay
+        )
+        request = request_class(config)
+        request._gateways.update(slow=SlowGateway('slow', 0.5), fast=SlowGateway('fast', 0))
+        return request
+
+    def test_sequential_by_default(self):
+        """Test gateways are tried one after another without a hedge delay."""
+        request = self.make_request(SMSRequest, None)
+        self.assertEqual('slow', request.send('13800000000', 'hello', gateways=['slow', 'fast']).gateway)
+
+    def test_hedged_send(self):
+        """Test the next gateway answers first once the hedge delay has passed."""
+        request = self.make_request(SMSRequest, 0.05)
+        self.assertEqual('fast', request.send('13800000000', 'hello', gateways=['slow', 'fast']).gateway)
+
+    def test_hedged_send_async(self):
+        """Test the async path hedges the same way."""
+        request = self.make_request(AsyncSMSRequest, 0.05)
+        response = asyncio.run(request.send_async('13800000000', 'hello', gateways=['slow', 'fast']))
+        self.assertEqual('fast', response.gateway)
+
+    def test_hedged_send_async_cancels_losers(self):
+        """Test the slower request is cancelled once the hedged send has a result."""
+        request = self.make_request(AsyncSMSRequest, 0.05)
+        slow = request._gateways['slow']
+
+        async def run():
+            async with request:
+                response = await request.send_async('13800000000', 'hello', gateways=['slow', 'fast'])
+                # Let the cancelled task reach its cancellation point; asyncio.run would cancel it only on exit
+                await asyncio.sleep(0)
+                return response, slow.cancelled
+
+        response, cancelled = asyncio.run(run())
+        self.assertEqual('fast', response.gateway)
+        self.assertTrue(cancelled)
+        self.assertEqual([], slow.sent)
+
+
+class BadNumber:
+    """A recipient that cannot be converted to a phone number."""
+
+    def __str__(self):
+        raise ValueError('malformed number')
+
+
+class BatchSendTest(unittest.TestCase):
+    """Test one malformed recipient does not abort a batch."""
+
+    def make_request(self, request_class):
+        request = request_class(SMSConfig(gateways={'fast': GatewayConfig(app_id='id')}))
+        request._gateways.update(fast=SlowGateway('fast', 0))
+        return request
+
+    def assert_batch(self, batch):
+        self.assertEqual(['13800000000', None, '13800000001'], [
+            response.phone_number if response.is_success else None for response in batch.responses
+        ])
+        self.assertEqual('SEND_FAILED', batch.responses[1].error.code)
+        self.assertEqual('malformed number', batch.responses[1].error.message)
+
+    def test_batch_send(self):
+        """Test the malformed number gets its own failed response."""
+        request = self.make_request(SMSRequest)
+        self.assert_batch(request.batch_send(['13800000000', BadNumber(), '13800000001'], 'hello'))
+
+    def test_send_many_async(self):
+        """Test the async path keeps the results in recipient order."""
+        request = self.make_request(AsyncSMSRequest)
+        self.assert_batch(asyncio.run(request.send_many_async(['13800000000', BadNumber(), '13800000001'], content='hello')))
+
+    def test_send_many_async_bulk_fallback(self):
+        """Test numbers the bulk gateway failed are re-sent through the fallback gateways."""
+        config = SMSConfig(gateways={'bulk': GatewayConfig(app_id='id'), 'fast': GatewayConfig(app_id='id')})
+        request = AsyncSMSRequest(config)
+        request._gateways.update(bulk=BulkGateway('bulk', 0), fast=SlowGateway('fast', 0))
+
+        async def run():
+            async with request:
+                return await request.send_many_async(
+                    ['13800000000', '13800000001', '13800000002'], content='hello', gateways=['bulk', 'fast']
+                )
+
+        batch = asyncio.run(run())
+        self.assertTrue(batch.is_success)
+        self.assertEqual(['bulk', 'fast', 'fast'], [response.gateway for response in batch.responses])
+        self.assertEqual(['13800000001', '13800000002'], sorted(request._gateways['fast'].sent))
+
+
+class BuilderPrewarmTest(unittest.TestCase):
+    """Test connection prewarming is opt-in."""
+
+    def test_no_prewarm_by_default(self):
+        """Test build makes no connections unless prewarm() was called."""
+        with mock.patch.object(SMSRequest, 'prewarm') as prewarm:
+            SMSBuilder.builder().yunpian(api_key='key').build()
+            prewarm.assert_not_called()
+            SMSBuilder.builder().yunpian(api_key='key').prewarm().build()
+            prewarm.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
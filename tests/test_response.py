@@ -0,0 +1,95 @@
+"""
+Tests for SMSBatchResponse.
+"""
+
+import unittest
+from senweaver_sms.response import SMSBatchResponse, SMSResponse, SMSStatus
+
+
+class SMSBatchResponseTest(unittest.TestCase):
+    """Test the SMSBatchResponse class."""
+
+    def setUp(self):
+        self.ok = SMSResponse.success(gateway='aliyun', phone_number='13800000000')
+        self.failed = SMSResponse.failed(
+            gateway='qcloud', phone_number='13800000001', error_code='E1', error_message='error'
+        )
+
+    def test_partitions(self):
+        """Test responses are grouped by status and gateway."""
+        batch = SMSBatchResponse([self.ok])
+        batch.add_response(self.failed)
+        self.assertEqual([self.ok], batch.get_success_responses())
+        self.assertEqual([self.failed], batch.get_failed_responses())
+        self.assertEqual(([self.ok], [self.failed]), batch.partition())
+        self.assertEqual([self.failed], batch.get_gateway_responses('qcloud'))
+        self.assertEqual([], batch.get_gateway_responses('missing'))
+        self.assertFalse(batch.is_success)
+        self.assertEqual((1, 1), (batch.success_count, batch.failure_count))
+        self.assertEqual('批量短信发送结果 [成功: 1] [失败: 1] [总计: 2]', str(batch))
+
+    def test_add_responses(self):
+        """Test bulk adds give the same results as single adds."""
+        batch = SMSBatchResponse()
+        batch.add_responses([self.ok, self.failed, self.ok])
+        self.assertEqual([self.ok, self.failed, self.ok], batch.responses)
+        self.assertEqual([self.ok, self.ok], batch.get_gateway_responses('aliyun'))
+        self.assertEqual((2, 1), (batch.success_count, batch.failure_count))
+
+    def test_is_success(self):
+        """Test a batch succeeds only when it is non-empty and every response succeeded."""
+        batch = SMSBatchResponse()
+        self.assertFalse(batch.is_success)
+        batch.add_response(self.ok)
+        self.assertTrue(batch.is_success)
+
+    def test_status_changed_after_add(self):
+        """Test the results follow a response whose status changes after it was added."""
+        pending = SMSResponse(status=SMSStatus.PENDING, gateway='aliyun', phone_number='13800000002')
+        batch = SMSBatchResponse([self.ok, pending])
+        self.assertEqual((1, 0), (batch.success_count, batch.failure_count))
+        self.assertFalse(batch.is_success)
+
+        pending.status = SMSStatus.SUCCESS
+        self.assertEqual([self.ok, pending], batch.get_success_responses())
+        self.assertEqual(([self.ok, pending], []), batch.partition())
+        self.assertTrue(batch.is_success)
+        self.assertEqual('批量短信发送结果 [成功: 2] [失败: 0] [总计: 2]', str(batch))
+
+    def test_direct_append(self):
+        """Test responses appended to the list directly are included in the results."""
+        batch = SMSBatchResponse([self.ok])
+        batch.responses.append(self.failed)
+        self.assertEqual([self.failed], batch.get_failed_responses())
+        self.assertEqual([self.failed], batch.get_gateway_responses('qcloud'))
+        self.assertEqual((1, 1), (batch.success_count, batch.failure_count))
+        self.assertFalse(batch.is_success)
+
+        batch.responses[1] = self.ok
+        self.assertEqual([self.ok, self.ok], batch.get_gateway_responses('aliyun'))
+        self.assertEqual([], batch.get_gateway_responses('qcloud'))
+        self.assertTrue(batch.is_success)
+
+
+class SMSResponseTest(unittest.TestCase):
+    """Test the SMSResponse class."""
+
+    def test_str_follows_changes(self):
+        """Test the string form is built from the current field values."""
+        response = SMSResponse.success(gateway='aliyun', phone_number='13800000000')
+        self.assertEqual('短信发送成功 [网关: aliyun] [手机号: 13800000000] [消息ID: 未知]', str(response))
+        response.message_id = 'm-1'
+        self.assertEqual('短信发送成功 [网关: aliyun] [手机号: 13800000000] [消息ID: m-1]', str(response))
+
+    def test_empty_defaults_shared(self):
+        """Test responses without raw data share one read-only empty dict."""
+        ok = SMSResponse.success(gateway='aliyun', phone_number='13800000000')
+        failed = SMSResponse.failed(gateway='aliyun', phone_number='13800000000', error_code='E1', error_message='error')
+        self.assertIs(ok.raw_response, failed.error.details)
+        self.assertEqual({}, ok.raw_response)
+        with self.assertRaises(TypeError):
+            ok.raw_response['key'] = 'value'
+
+
+if __name__ == '__main__':
+    unittest.main()